@@ -12,12 +12,17 @@ setup(
         "pandas>=2.0.0",
         "numpy>=1.24.0",
         "pyyaml>=6.0",
-        "streamlit>=1.28.0",
+        "streamlit>=1.37.0",
         "plotly>=5.17.0",
         "python-pptx>=0.6.21",
         "scipy>=1.11.0",
         "openpyxl>=3.1.0",
+        "pyarrow>=14.0.0",
     ],
+    extras_require={
+        # Brotli-compressed HTTP responses (requests negotiates br when installed)
+        "compression": ["brotli>=1.1.0"],
+    },
     python_requires=">=3.8",
 )
 
@@ -5,15 +5,13 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from pathlib import Path
-import pickle
 import sys
+from typing import Dict, Tuple
 
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from src.models.scoring import MarketScorer
-from src.models.forecast import generate_scenarios
-from src.models.monte_carlo import MonteCarloSimulator
+from src.models.scoring import FEATURE_MAPPING, MarketScorer
 
 
 # Page config
@@ -26,44 +24,112 @@ st.set_page_config(
 st.title("🌏 APAC Expansion Decision Engine")
 st.markdown("**Data-driven market prioritization and revenue forecasting for B2B SaaS expansion**")
 
-# Load data
-@st.cache_data(ttl=60)  # Cache for 60 seconds, then refresh
-def load_data():
-    """Load processed data."""
-    data_path = Path("data/processed/market_features.csv")
+DATA_PATH = Path("data/processed/market_features.csv")
+PARQUET_PATH = DATA_PATH.with_suffix(".parquet")
+ASSUMPTIONS_PATH = Path("config/assumptions.yml")
+
+# Standardized features used by the scorer, radar chart, and sensitivity analysis
+FEATURE_COLS = list(FEATURE_MAPPING.values())
+
+# Raw indicators shown on the Market Profiles tab
+PROFILE_COLS = [
+    "population_total",
+    "gdp_per_capita_usd",
+    "internet_users_pct",
+    "rule_of_law",
+    "regulatory_quality",
+    "cpi_score"
+]
+
+# Only these columns are read from the processed features file
+NEEDED_COLS = frozenset(["country_code", *FEATURE_COLS, *PROFILE_COLS])
+
+
+def get_data_path() -> Path:
+    """Prefer the Parquet copy of the processed data unless the CSV is newer."""
+    if PARQUET_PATH.exists() and (
+        not DATA_PATH.exists()
+        or PARQUET_PATH.stat().st_mtime >= DATA_PATH.stat().st_mtime
+    ):
+        return PARQUET_PATH
+    return DATA_PATH
+
+
+def get_data_mtime() -> float:
+    """Return the processed data file's modification time, stopping if it is missing."""
+    data_path = get_data_path()
     if not data_path.exists():
         st.error("Processed data not found. Please run `python -m src.main` first.")
         st.stop()
+    return data_path.stat().st_mtime
+
+
+# Load data
+@st.cache_data(ttl=60)  # Cache for 60 seconds, then refresh
+def load_data(data_mtime: float) -> Tuple[pd.DataFrame, np.ndarray, Dict[str, int]]:
+    """
+    Load processed data (file modification time is part of the cache key).
     
-    # Use file modification time as part of cache key to ensure fresh data
-    file_mtime = data_path.stat().st_mtime
-    
-    df = pd.read_csv(data_path)
+    Returns:
+        Tuple of (market DataFrame, float32 matrix of FEATURE_COLS in row
+        order, mapping of country_code to row position)
+    """
+    # country_code is categorical only here: this frame is read-only for the
+    # session, whereas the pipeline merges and writes its frames, so codes
+    # stay plain strings there
+    feature_dtypes = {col: "float32" for col in FEATURE_COLS}
+    data_path = get_data_path()
+    if data_path == PARQUET_PATH:
+        import pyarrow.parquet as pq
+        
+        available = pq.read_schema(data_path).names
+        df = pd.read_parquet(
+            data_path,
+            engine="pyarrow",
+            columns=[col for col in available if col in NEEDED_COLS]
+        )
+        df = df.astype({
+            "country_code": "category",
+            **{col: dtype for col, dtype in feature_dtypes.items() if col in df.columns}
+        })
+    else:
+        # Raw indicators stay float64 so large values (e.g. population) display exactly
+        df = pd.read_csv(
+            data_path,
+            usecols=lambda col: col in NEEDED_COLS,
+            dtype={"country_code": "category", **feature_dtypes}
+        )
     
     # Verify standardized columns exist
-    required_std_cols = [
-        "market_size_score_standardized",
-        "purchasing_power_score_standardized",
-        "digital_readiness_score_standardized",
-        "governance_risk_score_standardized",
-        "corruption_risk_score_standardized"
-    ]
-    missing_cols = [col for col in required_std_cols if col not in df.columns]
+    missing_cols = [col for col in FEATURE_COLS if col not in df.columns]
     if missing_cols:
         st.error(f"Missing standardized columns: {missing_cols}")
         st.info("Please run `python -m src.main` to regenerate data.")
-        return df  # Return what we have anyway
+        # Continue with what we have; missing features count as zero
     
     # Don't merge with scoring results - we recalculate them in the dashboard anyway
     # This avoids losing columns during merge
     
-    return df
+    X_std = np.ascontiguousarray(
+        df.reindex(columns=FEATURE_COLS, fill_value=0).to_numpy(dtype=np.float32)
+    )
+    code_to_row = {code: i for i, code in enumerate(df["country_code"])}
+    
+    return df, X_std, code_to_row
 
 
-def create_radar_chart(df: pd.DataFrame, country_code: str) -> go.Figure:
-    """Create radar chart for a specific market."""
-    country_data = df[df["country_code"] == country_code].iloc[0]
-    
+def radar_values(X_std: np.ndarray) -> np.ndarray:
+    """Map standardized features of every market onto the radar's 0-1 scale."""
+    # Normalize to 0-1 scale for radar (assuming z-scores)
+    return np.clip((X_std + 3) / 6, 0, 1)  # Rough normalization
+
+
+def create_radar_chart(
+    radar_matrix: np.ndarray,
+    code_to_row: Dict[str, int],
+    country_code: str
+) -> go.Figure:
+    """Create radar chart for a specific market from the precomputed radar matrix."""
     categories = [
         "Market Size",
         "Purchasing Power",
@@ -72,26 +138,12 @@ def create_radar_chart(df: pd.DataFrame, country_code: str) -> go.Figure:
         "Corruption"
     ]
     
-    feature_cols = [
-        "market_size_score_standardized",
-        "purchasing_power_score_standardized",
-        "digital_readiness_score_standardized",
-        "governance_risk_score_standardized",
-        "corruption_risk_score_standardized"
-    ]
-    
-    values = []
-    for col in feature_cols:
-        val = country_data.get(col, 0)
-        # Normalize to 0-1 scale for radar (assuming z-scores)
-        val_normalized = (val + 3) / 6  # Rough normalization
-        val_normalized = np.clip(val_normalized, 0, 1)
-        values.append(val_normalized)
+    values = radar_matrix[code_to_row[country_code]]
     
     fig = go.Figure()
     
     fig.add_trace(go.Scatterpolar(
-        r=values,
+        r=values.tolist(),
         theta=categories,
         fill='toself',
         name=country_code,
@@ -112,53 +164,209 @@ def create_radar_chart(df: pd.DataFrame, country_code: str) -> go.Figure:
     return fig
 
 
+@st.cache_data(ttl=600)
+def score_cached(
+    data_mtime: float,
+    weights_tuple: Tuple[Tuple[str, float], ...],
+    _df: pd.DataFrame,
+    _X_std: np.ndarray
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Score markets, cached on data version and weights so unchanged reruns skip scoring.
+    
+    _df and _X_std are the session's loaded market frame and feature matrix;
+    both are excluded from the cache key (they are fully determined by
+    data_mtime). weights_tuple must follow FEATURE_COLS order so it lines up
+    with _X_std.
+    
+    Returns:
+        Tuple of (scored markets sorted by rank, top 10 markets by score in
+        ascending order for the horizontal ranking chart)
+    """
+    scored_df = MarketScorer(dict(weights_tuple)).score_markets(_df, features=_X_std)
+    # Index by market for O(1) row lookups; unnamed so "country_code" stays
+    # unambiguous as a column
+    scored_df = scored_df.set_index("country_code", drop=False)
+    scored_df.index.name = None
+    
+    # scored_df is already in rank order, so the chart slice needs no re-sort
+    top10 = scored_df[["country_code", "total_score"]].dropna(subset=["total_score"])
+    top10 = top10.head(10).iloc[::-1]
+    
+    return scored_df, top10
+
+
+@st.cache_resource
+def load_assumptions(assumptions_mtime: float) -> Dict:
+    """
+    Parse business assumptions once per file version (mtime is the cache key).
+    
+    The returned dict is shared across reruns and sessions; treat it as read-only.
+    """
+    import yaml
+    
+    return yaml.safe_load(ASSUMPTIONS_PATH.read_text())
+
+
+@st.cache_data(ttl=600)
+def scenarios_cached(
+    assumptions: Dict,
+    market_adjustment: float,
+    months: int
+) -> Dict[str, pd.DataFrame]:
+    """Generate all forecast scenarios once per (assumptions, adjustment, horizon)."""
+    from src.models.forecast import generate_scenarios
+    
+    return generate_scenarios(
+        assumptions,
+        market_adjustment=market_adjustment,
+        months=months
+    )
+
+
+@st.cache_resource
+def forecast_base_layout() -> go.Layout:
+    """Static layout for the forecast chart, validated once per process (read-only)."""
+    return go.Layout(
+        xaxis_title="Month",
+        yaxis_title="USD",
+        height=500
+    )
+
+
+@st.cache_resource
+def sensitivity_base_layout() -> go.Layout:
+    """Static layout for the sensitivity chart, validated once per process (read-only)."""
+    return go.Layout(
+        xaxis_title="Criterion Weight",
+        yaxis_title="Market Rank (1 = Best)",
+        yaxis=dict(
+            autorange="reversed",  # Rank 1 at top
+            tickmode="linear",
+            tick0=1,
+            dtick=1
+        ),
+        height=500,
+        hovermode='x unified',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+
+
+def summarize_rank_stability(sens_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summarize rank and score stability per market across a sensitivity sweep.
+    
+    Groups rows by country with a single sort and np.*.reduceat calls rather
+    than a pandas groupby/agg.
+    
+    Args:
+        sens_df: Sensitivity results with country_code, rank, and total_score
+        
+    Returns:
+        DataFrame indexed by country_code, sorted by average rank
+    """
+    codes, uniques = pd.factorize(sens_df["country_code"], sort=True)
+    order = np.argsort(codes, kind="stable")
+    starts = np.flatnonzero(np.diff(codes[order], prepend=-1))
+    counts = np.diff(np.append(starts, len(codes)))
+    
+    ranks = sens_df["rank"].to_numpy()[order]
+    rank_vals = ranks.astype(np.float32)
+    score_vals = sens_df["total_score"].to_numpy(dtype=np.float32)[order]
+    
+    def mean_std(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        mean = np.add.reduceat(values, starts) / counts
+        sq_dev = np.add.reduceat((values - np.repeat(mean, counts)) ** 2, starts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(sq_dev / (counts - 1))  # Sample std, as pandas
+        return mean, std
+    
+    rank_mean, rank_std = mean_std(rank_vals)
+    score_mean, score_std = mean_std(score_vals)
+    best_rank = np.minimum.reduceat(ranks, starts)
+    worst_rank = np.maximum.reduceat(ranks, starts)
+    
+    stability = pd.DataFrame(
+        {
+            "Avg_Rank": rank_mean,
+            "Rank_StdDev": rank_std,
+            "Best_Rank": best_rank,
+            "Worst_Rank": worst_rank,
+            "Avg_Score": score_mean,
+            "Score_StdDev": score_std,
+            "Rank_Range": worst_rank - best_rank,
+        },
+        index=pd.Index(uniques, name="country_code"),
+    )
+    return stability.sort_values("Avg_Rank")
+
+
 # Load data
-df = load_data()
+data_mtime = get_data_mtime()
+# Keep the loaded data in session state so reruns reuse the same arrays
+# instead of copying them out of the data cache
+if st.session_state.get("data_mtime") != data_mtime:
+    st.session_state.market_data = load_data(data_mtime)
+    market_df, market_X_std, _ = st.session_state.market_data
+    # Radar chart values for every market
+    st.session_state.radar_matrix = radar_values(market_X_std)
+    # Market selectbox options, built once per data version
+    st.session_state.codes = tuple(market_df["country_code"].unique().tolist())
+    # Profile indicators per market as plain dicts for the Market Profiles tab
+    profile_df = market_df[[col for col in PROFILE_COLS if col in market_df.columns]]
+    st.session_state.records = dict(
+        zip(market_df["country_code"], profile_df.to_dict("records"))
+    )
+    st.session_state.data_mtime = data_mtime
+df, X_std, code_to_row = st.session_state.market_data
 
 # Sidebar
 st.sidebar.header("Configuration")
 
 # Data status check (collapsible)
+data_cols = frozenset(df.columns)
+missing_std_cols = [col for col in FEATURE_COLS if col not in data_cols]
 with st.sidebar.expander("📊 Data Status", expanded=False):
     if len(df) > 0:
         st.write(f"✅ Markets loaded: {len(df)}")
-        std_cols = [col for col in df.columns if 'standardized' in col]
-        st.write(f"📈 Standardized columns: {len(std_cols)}")
-        if len(std_cols) == 0:
-            st.error("⚠️ No standardized columns found!")
-            st.info("Run `python -m src.main` to generate them.")
-        else:
-            st.success("✅ Standardized features ready")
-            # Check if key standardized columns exist
-            required = [
-                "market_size_score_standardized",
-                "purchasing_power_score_standardized",
-                "digital_readiness_score_standardized",
-                "governance_risk_score_standardized",
-                "corruption_risk_score_standardized"
-            ]
-            missing = [c for c in required if c not in df.columns]
-            if missing:
-                st.error(f"Missing: {missing}")
+        # Detailed diagnostics only run when asked for
+        if st.checkbox("Show diagnostics", key="debug"):
+            std_cols = [col for col in data_cols if 'standardized' in col]
+            st.write(f"📈 Standardized columns: {len(std_cols)}")
+            if len(std_cols) == 0:
+                st.error("⚠️ No standardized columns found!")
+                st.info("Run `python -m src.main` to generate them.")
             else:
-                # Show sample values
-                sample_vals = df[required].iloc[0] if len(df) > 0 else None
-                if sample_vals is not None:
+                st.success("✅ Standardized features ready")
+                # Check if key standardized columns exist
+                if missing_std_cols:
+                    st.error(f"Missing: {missing_std_cols}")
+                else:
+                    # Show sample values
+                    sample_vals = df[FEATURE_COLS].iloc[0]
                     st.write("Sample values (first market):")
-                    for col in required:
+                    for col in FEATURE_COLS:
                         val = sample_vals[col]
                         st.write(f"  {col}: {val:.4f}")
-        st.write(f"📁 Total columns: {len(df.columns)}")
+            st.write(f"📁 Total columns: {len(data_cols)}")
         if st.button("🔄 Clear Streamlit Cache", help="Force reload data on next refresh"):
             st.cache_data.clear()
+            # Drop the session copy too so the next run reloads from disk
+            st.session_state.pop("data_mtime", None)
             st.success("Cache cleared! Refreshing...")
             st.rerun()
     
     # Additional debug: Check standardized columns are actually present
     if len(df) > 0:
-        std_cols_check = [col for col in df.columns if any(x in col for x in ['market_size_score_standardized', 'purchasing_power_score_standardized', 'digital_readiness_score_standardized', 'governance_risk_score_standardized', 'corruption_risk_score_standardized'])]
-        if len(std_cols_check) < 5:
-            st.sidebar.error(f"⚠️ Missing standardized cols! Found: {std_cols_check}")
+        if missing_std_cols:
+            found = [col for col in FEATURE_COLS if col in data_cols]
+            st.sidebar.error(f"⚠️ Missing standardized cols! Found: {found}")
     else:
         st.error("❌ No data loaded")
 
@@ -208,8 +416,9 @@ if abs(total_weight - 1.0) > 0.01:
     weights = {k: v / total_weight for k, v in weights.items()}
 
 # Score markets with current weights (compute once for all tabs)
-scorer = MarketScorer(weights)
-scored_df = scorer.score_markets(df)
+scored_df, top10 = score_cached(
+    data_mtime, tuple((k, weights[k]) for k in FEATURE_MAPPING), df, X_std
+)
 
 # Debug: Verify scores were calculated properly
 if "total_score" in scored_df.columns:
@@ -247,18 +456,31 @@ with tab1:
     display_cols = [col for col in display_cols if col in scored_df.columns]
     
     if len(scored_df) > 0:
+        # Format scores in the browser instead of rounding a copy of the frame
+        score_format = {
+            col: st.column_config.NumberColumn(format="%.3f")
+            for col in display_cols
+            if col not in ("rank", "country_code")
+        }
         st.dataframe(
-            scored_df[display_cols].round(3),
+            scored_df[display_cols].head(20),
             use_container_width=True,
-            hide_index=True
+            hide_index=True,
+            column_config=score_format
         )
+        if len(scored_df) > 20:
+            with st.expander("Show all markets", expanded=False):
+                st.dataframe(
+                    scored_df[display_cols],
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config=score_format
+                )
         
         # Ranking bar chart - Fix: ensure data is valid and properly formatted
         if "total_score" in scored_df.columns:
-            # Filter valid data and get top 10
-            chart_data = scored_df[["country_code", "total_score"]].copy()
-            chart_data = chart_data.dropna(subset=["total_score"])
-            chart_data = chart_data.head(10)
+            # Top 10 valid scores, precomputed alongside the scores
+            chart_data = top10
             
             # Debug info (collapsible)
             with st.expander("🔍 Debug Info", expanded=False):
@@ -311,9 +533,7 @@ with tab1:
                     
                     st.info("💡 **Solution:** If columns exist but scores are zero, try clicking 'Clear Streamlit Cache' in the sidebar and refresh.")
                 else:
-                    # Sort by score for proper display (lowest to highest for horizontal bars)
-                    chart_data = chart_data.sort_values("total_score", ascending=True)
-                    
+                    # chart_data is already lowest to highest for horizontal bars
                     # Create the bar chart
                     fig_rank = px.bar(
                         chart_data,
@@ -351,14 +571,17 @@ with tab1:
     else:
         st.warning("No data available for ranking")
 
+
 # Tab 2: Market Profiles
-with tab2:
+@st.fragment
+def profiles_tab(df: pd.DataFrame, code_to_row: Dict[str, int]) -> None:
+    """Render the Market Profiles tab; its widgets rerun only this fragment."""
     st.header("Market Profiles")
     
     if len(df) > 0:
         selected_market = st.selectbox(
             "Select market",
-            df["country_code"].unique()
+            st.session_state.codes
         )
         
         # Check if standardized columns exist
@@ -373,7 +596,9 @@ with tab2:
         if all(col in df.columns for col in required_cols):
             # Radar chart
             try:
-                fig_radar = create_radar_chart(df, selected_market)
+                fig_radar = create_radar_chart(
+                    st.session_state.radar_matrix, code_to_row, selected_market
+                )
                 st.plotly_chart(fig_radar, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating radar chart: {e}")
@@ -381,7 +606,7 @@ with tab2:
             st.warning("Standardized feature columns not found. Please run `python -m src.main` first.")
         
         # Market details
-        market_data = df[df["country_code"] == selected_market].iloc[0]
+        market_data = st.session_state.records[selected_market]
         
         col1, col2, col3 = st.columns(3)
         
@@ -399,41 +624,47 @@ with tab2:
     else:
         st.warning("No market data available")
 
+
+with tab2:
+    profiles_tab(df, code_to_row)
+
+
 # Tab 3: Forecast
-with tab3:
+@st.fragment
+def forecast_tab(df: pd.DataFrame, scored_df: pd.DataFrame, scenario: str) -> None:
+    """Render the Forecast tab; its widgets rerun only this fragment."""
     st.header("Revenue Forecast")
     
     if len(df) > 0 and len(scored_df) > 0:
         selected_market_forecast = st.selectbox(
             "Select market for forecast",
-            df["country_code"].unique(),
+            st.session_state.codes,
             key="forecast_market"
         )
         
         try:
             # Load assumptions
-            import yaml
-            with open("config/assumptions.yml", "r") as f:
-                assumptions = yaml.safe_load(f)
+            assumptions = load_assumptions(ASSUMPTIONS_PATH.stat().st_mtime)
             
             # Market adjustment based on score
-            market_row = scored_df[scored_df["country_code"] == selected_market_forecast].iloc[0]
-            market_adjustment = (market_row["total_score"] + 3) / 6  # Rough normalization to 0-1
+            market_score = scored_df.at[selected_market_forecast, "total_score"]
+            market_adjustment = (market_score + 3) / 6  # Rough normalization to 0-1
             market_adjustment = np.clip(market_adjustment, 0.5, 1.5)
             
             # Get forecast months from assumptions, default to 36
             forecast_months = assumptions.get("simulation", {}).get("months", 36)
             
-            scenarios = generate_scenarios(
+            scenarios = scenarios_cached(
                 assumptions,
-                market_adjustment=market_adjustment,
-                months=forecast_months
+                round(float(market_adjustment), 4),
+                forecast_months
             )
             
             forecast_df = scenarios[scenario]
             
             # Plot forecast
-            fig_forecast = go.Figure()
+            # Figure copies the cached layout, so the shared one is never mutated
+            fig_forecast = go.Figure(layout=forecast_base_layout())
             fig_forecast.add_trace(go.Scatter(
                 x=forecast_df["month"],
                 y=forecast_df["cumulative_net_revenue"],
@@ -448,10 +679,7 @@ with tab3:
                 line_color="red"
             )
             fig_forecast.update_layout(
-                title=f"Revenue Forecast: {selected_market_forecast} ({scenario})",
-                xaxis_title="Month",
-                yaxis_title="USD",
-                height=500
+                title=f"Revenue Forecast: {selected_market_forecast} ({scenario})"
             )
             st.plotly_chart(fig_forecast, use_container_width=True)
             
@@ -474,8 +702,15 @@ with tab3:
     else:
         st.warning("No data available for forecasting")
 
+
+with tab3:
+    forecast_tab(df, scored_df, scenario)
+
+
 # Tab 4: Sensitivity
-with tab4:
+@st.fragment
+def sensitivity_tab(df: pd.DataFrame, weights: Dict[str, float]) -> None:
+    """Render the Sensitivity tab; its widgets rerun only this fragment."""
     st.header("Sensitivity Analysis")
     
     # Add explanation
@@ -525,13 +760,7 @@ with tab4:
             
             if len(sens_df) > 0:
                 # Calculate summary statistics
-                market_stability = sens_df.groupby("country_code").agg({
-                    "rank": ["mean", "std", "min", "max"],
-                    "total_score": ["mean", "std"]
-                }).round(2)
-                market_stability.columns = ["Avg_Rank", "Rank_StdDev", "Best_Rank", "Worst_Rank", "Avg_Score", "Score_StdDev"]
-                market_stability = market_stability.sort_values("Avg_Rank")
-                market_stability["Rank_Range"] = market_stability["Worst_Rank"] - market_stability["Best_Rank"]
+                market_stability = summarize_rank_stability(sens_df)
                 
                 # Show summary table
                 st.subheader("📊 Rank Stability Summary")
@@ -541,7 +770,12 @@ with tab4:
                 summary_display["Stability"] = summary_display["Rank Range"].apply(
                     lambda x: "🔴 High Variation" if x > 3 else "🟡 Medium Variation" if x > 1 else "🟢 Stable"
                 )
-                st.dataframe(summary_display, use_container_width=True, hide_index=True)
+                st.dataframe(
+                    summary_display,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={"Avg Rank": st.column_config.NumberColumn(format="%.2f")}
+                )
                 
                 # Market selection for chart
                 st.subheader("📈 Sensitivity Chart")
@@ -560,17 +794,18 @@ with tab4:
                     # Filter data for selected markets
                     chart_data = sens_df[sens_df["country_code"].isin(selected_markets)].copy()
                     
-                    # Create cleaner visualization
-                    fig_sens = go.Figure()
+                    # Create cleaner visualization (layout copied from the cached base)
+                    fig_sens = go.Figure(layout=sensitivity_base_layout())
+                    traces = []
                     
                     # Color palette
                     colors = px.colors.qualitative.Set3
                     
                     for i, market in enumerate(selected_markets):
                         market_data = chart_data[chart_data["country_code"] == market].sort_values("weight_value")
-                        fig_sens.add_trace(go.Scatter(
-                            x=market_data["weight_value"],
-                            y=market_data["rank"],
+                        traces.append(go.Scattergl(
+                            x=market_data["weight_value"].to_numpy(),
+                            y=market_data["rank"].to_numpy(),
                             mode='lines+markers',
                             name=market,
                             line=dict(width=2.5),
@@ -580,6 +815,7 @@ with tab4:
                                         "Rank: %{y}<br>" +
                                         "<extra></extra>"
                         ))
+                    fig_sens.add_traces(traces)
                     
                     # Add vertical line for current weight
                     current_weight = weights[weight_to_analyze]
@@ -592,24 +828,7 @@ with tab4:
                     )
                     
                     fig_sens.update_layout(
-                        title=f"Market Ranking Sensitivity: {weight_to_analyze.replace('_', ' ').title()}",
-                        xaxis_title="Criterion Weight",
-                        yaxis_title="Market Rank (1 = Best)",
-                        yaxis=dict(
-                            autorange="reversed",  # Rank 1 at top
-                            tickmode="linear",
-                            tick0=1,
-                            dtick=1
-                        ),
-                        height=500,
-                        hovermode='x unified',
-                        legend=dict(
-                            orientation="h",
-                            yanchor="bottom",
-                            y=1.02,
-                            xanchor="right",
-                            x=1
-                        )
+                        title=f"Market Ranking Sensitivity: {weight_to_analyze.replace('_', ' ').title()}"
                     )
                     
                     st.plotly_chart(fig_sens, use_container_width=True)
@@ -638,3 +857,6 @@ with tab4:
     else:
         st.warning("No data available for sensitivity analysis")
 
+
+with tab4:
+    sensitivity_tab(df, weights)
@@ -0,0 +1,48 @@
+"""Shared HTTP session for the data source clients."""
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+USER_AGENT = "APAC-Expansion-Engine/1.0"
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    """Create a session with pooled keep-alive connections and retries."""
+    session = requests.Session()
+    # requests already advertises every encoding urllib3 can decode, including
+    # br when the optional brotli package is installed
+    session.headers.update({"User-Agent": USER_AGENT})
+    
+    retries = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504)
+    )
+    adapter = HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Get the process-wide HTTP session shared by all clients.
+    
+    Reusing one session keeps TCP/TLS connections to each host alive
+    across requests instead of reconnecting for every call.
+    
+    Returns:
+        Shared requests.Session
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = _build_session()
+    return _SESSION
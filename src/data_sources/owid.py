@@ -1,10 +1,14 @@
 """Our World in Data (OWID) data downloader for Corruption Perceptions Index."""
 import os
-from typing import Optional, Dict
+import json
+import re
+from io import BytesIO
+from typing import Optional, Dict, Tuple
 from pathlib import Path
-import requests
 import pandas as pd
 
+from src.data_sources._http import get_session
+
 
 # Country name to ISO3 code mapping (for OWID data)
 COUNTRY_NAME_TO_CODE: Dict[str, str] = {
@@ -36,6 +40,54 @@ FALLBACK_CPI: Dict[str, float] = {
     "VNM": 42.0,  # Vietnam
 }
 
+# Fallback CPI values as a frame indexed by country code
+_FALLBACK_DF = pd.DataFrame.from_dict(
+    FALLBACK_CPI, orient="index", columns=["cpi_score"]
+).rename_axis("country_code")
+
+
+def _fallback_cpi(country_codes: Optional[list] = None) -> pd.DataFrame:
+    """
+    Look up fallback CPI values without a per-code loop.
+    
+    Args:
+        country_codes: Country codes to return (all known values if None)
+        
+    Returns:
+        DataFrame with country_code and cpi_score, in request order
+    """
+    if not country_codes:
+        return _FALLBACK_DF.reset_index()
+    return _FALLBACK_DF.reindex(country_codes).dropna().reset_index()
+
+
+# Columns kept when parsing an OWID CPI export (plus the CPI column itself)
+OWID_ID_COLUMNS = ("Entity", "Code", "Year")
+
+# CPI column detection: name pattern, excluded id columns, then exact fallbacks
+_CPI_RE = re.compile(r"corruption|cpi", re.IGNORECASE)
+_CPI_EXCLUDED = frozenset({"code", "entity", "year"})
+_CPI_FALLBACK_NAMES = ("Corruption Perceptions Index", "Value")
+
+
+def _find_cpi_column(columns) -> Optional[str]:
+    """
+    Identify the CPI score column from column names alone.
+    
+    Args:
+        columns: Column names of an OWID CPI export
+        
+    Returns:
+        CPI column name, or None if no name matches
+    """
+    cpi_col = next(
+        (col for col in columns if _CPI_RE.search(col) and col.lower() not in _CPI_EXCLUDED),
+        None
+    )
+    if cpi_col is None:
+        cpi_col = next((name for name in _CPI_FALLBACK_NAMES if name in columns), None)
+    return cpi_col
+
 
 class OWIDClient:
     """Client for downloading OWID CSV datasets."""
@@ -46,25 +98,132 @@ class OWIDClient:
         """Initialize client with cache directory."""
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": "APAC-Expansion-Engine/1.0"})
+        self.session = get_session()
+        # dataset_name -> (raw columns, stripped columns, CPI column)
+        self._schema_cache: Dict[str, Tuple[Tuple[str, ...], pd.Index, str]] = {}
+        # (dataset_name, country codes) -> fetch_cpi result
+        self._result_cache: Dict[Tuple[str, Optional[Tuple[str, ...]]], pd.DataFrame] = {}
     
     def _get_cache_path(self, dataset_name: str) -> Path:
         """Get cache file path for dataset."""
-        return self.cache_dir / f"owid_{dataset_name}.csv"
+        return self.cache_dir / f"owid_{dataset_name}.parquet"
     
     def _load_from_cache(self, cache_path: Path) -> Optional[pd.DataFrame]:
-        """Load data from cache if available."""
+        """
+        Load data from cache if available.
+        
+        A CSV cache left by earlier versions is converted to Parquet the
+        first time it is read.
+        """
         if cache_path.exists():
             try:
-                return pd.read_csv(cache_path)
+                return pd.read_parquet(cache_path, engine="pyarrow")
             except Exception:
                 return None
+        
+        legacy_path = cache_path.with_suffix(".csv")
+        if legacy_path.exists():
+            try:
+                # Multi-threaded Arrow parser; pyarrow is a project dependency
+                df = pd.read_csv(legacy_path, engine="pyarrow")
+            except Exception:
+                return None
+            self._save_to_cache(cache_path, df)
+            return df
         return None
     
     def _save_to_cache(self, cache_path: Path, df: pd.DataFrame) -> None:
         """Save data to cache."""
-        df.to_csv(cache_path, index=False)
+        df.to_parquet(cache_path, engine="pyarrow", compression="zstd", index=False)
+    
+    def _get_validators_path(self, cache_path: Path) -> Path:
+        """Get sidecar path holding the HTTP validators for a cached dataset."""
+        return cache_path.with_suffix(".etag")
+    
+    def _load_validators(self, cache_path: Path) -> Dict[str, Optional[str]]:
+        """Load the sidecar validators for a cached dataset ({} if none)."""
+        validators_path = self._get_validators_path(cache_path)
+        if validators_path.exists() and cache_path.exists():
+            try:
+                return json.loads(validators_path.read_text())
+            except Exception:
+                return {}
+        return {}
+    
+    def _download_csv(
+        self,
+        url: str,
+        cache_path: Path,
+        cached: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Download and parse a CPI CSV, revalidating an existing cache first.
+        
+        If the cache came from the same URL, the request carries its ETag /
+        Last-Modified validators; a 304 reply reuses the cached table
+        without downloading the body again.
+        
+        Args:
+            url: CSV URL
+            cache_path: Cache file for the dataset
+            cached: Cached table already loaded by the caller, if any
+            
+        Returns:
+            Parsed (or revalidated cached) DataFrame
+        """
+        validators_path = self._get_validators_path(cache_path)
+        validators = self._load_validators(cache_path)
+        
+        headers = {}
+        if validators.get("url") == url:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        
+        response = self.session.get(url, headers=headers, timeout=30)
+        if response.status_code == 304:
+            if cached is None:
+                cached = self._load_from_cache(cache_path)
+            if cached is not None:
+                return cached
+            # Cache vanished or is unreadable; fetch the full body
+            response = self.session.get(url, timeout=30)
+        response.raise_for_status()
+        
+        df = self._read_cpi_csv(response.content)
+        self._save_to_cache(cache_path, df)
+        validators_path.write_text(json.dumps({
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified")
+        }))
+        return df
+    
+    def _read_cpi_csv(self, content: bytes) -> pd.DataFrame:
+        """
+        Parse an OWID CPI CSV, reading only the id columns and the CPI column.
+        
+        The raw response bytes are parsed directly (UTF-8), skipping the
+        decode into a Python str.
+        
+        Args:
+            content: CSV response body
+            
+        Returns:
+            Parsed DataFrame (all columns if the CPI column can't be named up front)
+        """
+        header = pd.read_csv(BytesIO(content), nrows=0).columns.str.strip()
+        cpi_col = _find_cpi_column(header)
+        if cpi_col is None:
+            return pd.read_csv(BytesIO(content))
+        
+        keep = {*OWID_ID_COLUMNS, cpi_col}
+        return pd.read_csv(
+            BytesIO(content),
+            usecols=lambda col: col.strip() in keep,
+            dtype={"Year": "Int16"}
+        )
     
     def fetch_cpi(
         self, 
@@ -83,6 +242,11 @@ class OWIDClient:
         Returns:
             DataFrame with CPI data
         """
+        # Repeat calls in the same process skip the CSV parse entirely
+        memo_key = (dataset_name, tuple(country_codes) if country_codes else None)
+        if use_cache and memo_key in self._result_cache:
+            return self._result_cache[memo_key].copy()
+        
         cache_path = self._get_cache_path(dataset_name)
         
         if use_cache:
@@ -94,18 +258,22 @@ class OWIDClient:
         else:
             df = None
         
+        # A cache with recorded validators is revalidated against its source
+        # (a 304 keeps it); offline or on any error the cached table is used
+        if df is not None:
+            source_url = self._load_validators(cache_path).get("url")
+            if source_url:
+                try:
+                    df = self._download_csv(source_url, cache_path, cached=df)
+                except Exception as e:
+                    print(f"Could not revalidate cached CPI data, using cache: {e}")
+        
         if df is None:
             # Try OWID grapher CSV export (more reliable endpoint)
             url = "https://ourworldindata.org/grapher/corruption-perception-index.csv"
             
             try:
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                
-                # Read from response content
-                from io import StringIO
-                df = pd.read_csv(StringIO(response.text))
-                self._save_to_cache(cache_path, df)
+                df = self._download_csv(url, cache_path)
                 
             except Exception as e:
                 print(f"Error fetching CPI from grapher CSV: {e}")
@@ -113,108 +281,90 @@ class OWIDClient:
                 try:
                     alt_url = f"{self.BASE_URL}/{dataset_name}/{dataset_name}.csv"
                     print(f"Trying GitHub raw URL: {alt_url}")
-                    response = self.session.get(alt_url, timeout=30)
-                    response.raise_for_status()
-                    from io import StringIO
-                    df = pd.read_csv(StringIO(response.text))
-                    self._save_to_cache(cache_path, df)
+                    df = self._download_csv(alt_url, cache_path)
                 except Exception as e2:
                     print(f"Fallback also failed: {e2}")
                     print("Using fallback CPI values from known data")
-                    # Use fallback CPI values
-                    if country_codes:
-                        fallback_data = {
-                            "country_code": [],
-                            "cpi_score": []
-                        }
-                        for code in country_codes:
-                            if code in FALLBACK_CPI:
-                                fallback_data["country_code"].append(code)
-                                fallback_data["cpi_score"].append(FALLBACK_CPI[code])
-                        return pd.DataFrame(fallback_data)
-                    else:
-                        # Return all fallback values
-                        return pd.DataFrame({
-                            "country_code": list(FALLBACK_CPI.keys()),
-                            "cpi_score": list(FALLBACK_CPI.values())
-                        })
-        
-        # Standardize column names
-        df.columns = df.columns.str.strip()
-        
-        # Find CPI column (might be named differently)
-        cpi_col = None
-        for col in df.columns:
-            col_lower = col.lower()
-            if ("corruption" in col_lower or "cpi" in col_lower) and col_lower not in ["code", "entity", "year"]:
-                cpi_col = col
-                break
-        
-        if cpi_col is None and "Corruption Perceptions Index" in df.columns:
-            cpi_col = "Corruption Perceptions Index"
-        elif cpi_col is None and "Value" in df.columns:
-            cpi_col = "Value"
-        elif cpi_col is None:
-            # Find first numeric column that's not Code, Entity, or Year
-            exclude_cols = {"Code", "Entity", "Year", "code", "entity", "year"}
-            for col in df.columns:
-                if col not in exclude_cols and pd.api.types.is_numeric_dtype(df[col]):
-                    cpi_col = col
-                    break
+                    # Use fallback CPI values (all of them if no countries given)
+                    return _fallback_cpi(country_codes)
+        
+        # Reuse the column resolution from an earlier call on the same layout
+        raw_columns = tuple(df.columns)
+        schema = self._schema_cache.get(dataset_name)
+        if schema is not None and schema[0] == raw_columns:
+            _, df.columns, cpi_col = schema
+        else:
+            # Standardize column names
+            df.columns = df.columns.str.strip()
+            
+            # Find CPI column (might be named differently)
+            cpi_col = _find_cpi_column(df.columns)
+            
+            if cpi_col is None:
+                # Find first numeric column that's not Code, Entity, or Year
+                exclude_cols = {"Code", "Entity", "Year", "code", "entity", "year"}
+                for col in df.columns:
+                    if col not in exclude_cols and pd.api.types.is_numeric_dtype(df[col]):
+                        cpi_col = col
+                        break
+            
+            if cpi_col is not None:
+                self._schema_cache[dataset_name] = (raw_columns, df.columns, cpi_col)
         
         if cpi_col is None:
             print("Warning: Could not identify CPI column")
             print(f"Available columns: {list(df.columns)}")
             return pd.DataFrame(columns=["country_code", "cpi_score"])
         
-        # Filter to latest year and specified countries
+        # Filter to specified countries first so the latest-year scan only
+        # covers their rows (CoW-safe views, no copies)
+        if country_codes and "Code" in df.columns:
+            df = df[df["Code"].isin(country_codes)]
+        elif country_codes and "Entity" in df.columns:
+            entity_names = [
+                name for name, code in COUNTRY_NAME_TO_CODE.items() if code in country_codes
+            ]
+            df = df[df["Entity"].isin(entity_names)]
+        
         if "Year" in df.columns:
             latest_year = df["Year"].max()
-            df = df[df["Year"] == latest_year].copy()
-        
-        if country_codes and "Code" in df.columns:
-            df = df[df["Code"].isin(country_codes)].copy()
+            df = df[df["Year"] == latest_year]
         
         # Standardize output
-        result = pd.DataFrame()
         if "Code" in df.columns:
-            result["country_code"] = df["Code"]
+            country_code = df["Code"]
+            keep = pd.Series(True, index=df.index)
         elif "Entity" in df.columns:
-            # Map entity names to codes
-            result["country_code"] = df["Entity"].map(
-                lambda x: COUNTRY_NAME_TO_CODE.get(x, None)
-            )
+            # Map entity names to codes (dict lookup, unmapped names become NaN)
+            country_code = df["Entity"].map(COUNTRY_NAME_TO_CODE)
             # Drop rows where we couldn't map
-            result = result[result["country_code"].notna()].copy()
+            keep = country_code.notna()
         else:
             print("Warning: No country code or entity column found")
             print(f"Available columns: {list(df.columns)}")
             return pd.DataFrame(columns=["country_code", "cpi_score"])
         
-        if cpi_col in df.columns:
-            result["cpi_score"] = pd.to_numeric(df[cpi_col], errors="coerce")
-        else:
+        if cpi_col not in df.columns:
             print("Warning: CPI score column not found")
             print(f"CPI column searched: {cpi_col}, Available columns: {list(df.columns)}")
             return pd.DataFrame(columns=["country_code", "cpi_score"])
         
         # Filter to requested countries if specified
         if country_codes:
-            result = result[result["country_code"].isin(country_codes)].copy()
+            keep &= country_code.isin(country_codes)
+        
+        # Build the output once from the filtered rows
+        result = pd.DataFrame({
+            "country_code": country_code[keep],
+            "cpi_score": pd.to_numeric(df.loc[keep, cpi_col], errors="coerce")
+        })
         
         # If result is empty and we have country codes, use fallback
         if len(result) == 0 and country_codes:
             print("CPI download returned no data, using fallback values")
-            fallback_data = {
-                "country_code": [],
-                "cpi_score": []
-            }
-            for code in country_codes:
-                if code in FALLBACK_CPI:
-                    fallback_data["country_code"].append(code)
-                    fallback_data["cpi_score"].append(FALLBACK_CPI[code])
-            if fallback_data["country_code"]:
-                result = pd.DataFrame(fallback_data)
+            fallback = _fallback_cpi(country_codes)
+            if len(fallback) > 0:
+                result = fallback
         
         # Debug output
         if len(result) > 0:
@@ -223,16 +373,18 @@ class OWIDClient:
                 missing = set(country_codes) - set(result["country_code"].unique())
                 if missing:
                     print(f"Warning: CPI missing for countries: {missing}")
-                    # Fill missing with fallback if available
-                    for code in missing:
-                        if code in FALLBACK_CPI:
-                            result = pd.concat([
-                                result,
-                                pd.DataFrame({"country_code": [code], "cpi_score": [FALLBACK_CPI[code]]})
-                            ], ignore_index=True)
-                            print(f"  Using fallback CPI for {code}: {FALLBACK_CPI[code]}")
-        
-        return result.reset_index(drop=True)
+                    # Fill missing with fallback if available (one concat, in request order)
+                    fallback = _fallback_cpi(
+                        [code for code in dict.fromkeys(country_codes) if code in missing]
+                    )
+                    for code, cpi_score in zip(fallback["country_code"], fallback["cpi_score"]):
+                        print(f"  Using fallback CPI for {code}: {cpi_score}")
+                    if len(fallback) > 0:
+                        result = pd.concat([result, fallback], ignore_index=True)
+        
+        result = result.reset_index(drop=True)
+        self._result_cache[memo_key] = result.copy()
+        return result
 
 
 if __name__ == "__main__":
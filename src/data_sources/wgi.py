@@ -1,10 +1,13 @@
 """Worldwide Governance Indicators (WGI) downloader."""
 import os
-from typing import Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
 from pathlib import Path
-import requests
 import pandas as pd
 
+from src.data_sources._http import get_session
+
 
 class WGIClient:
     """Client for downloading WGI data from World Bank DataBank."""
@@ -15,6 +18,7 @@ class WGIClient:
         "rule_of_law": "RL.EST",
         "regulatory_quality": "RQ.EST"
     }
+    MAX_WORKERS = 8  # Cap on per-country WGI calls in flight against the World Bank API
     
     # Direct CSV download from World Bank (alternative method)
     # Note: This uses a pre-exported CSV approach since direct API is complex
@@ -24,25 +28,86 @@ class WGIClient:
         """Initialize client with cache directory."""
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": "APAC-Expansion-Engine/1.0"})
+        self.session = get_session()
+        self._cache: Optional[Dict[Tuple[str, str], float]] = None
+        self._cache_dirty = False
+        self._cache_lock = threading.Lock()
+        self._results: Dict[Tuple[Tuple[str, ...], int], pd.DataFrame] = {}
     
-    def _get_cache_path(self, indicator_code: str) -> Path:
-        """Get cache file path for indicator."""
-        return self.cache_dir / f"wgi_{indicator_code}.csv"
+    def _get_cache_path(self) -> Path:
+        """Get path of the single cache table for all WGI values."""
+        return self.cache_dir / "wgi_cache.parquet"
     
-    def _load_from_cache(self, cache_path: Path) -> Optional[pd.DataFrame]:
-        """Load data from cache if available."""
-        if cache_path.exists():
-            try:
-                return pd.read_csv(cache_path)
-            except Exception:
-                return None
-        return None
+    def _load_cache(self) -> Dict[Tuple[str, str], float]:
+        """
+        Load the cache table into an in-memory index on first use.
+        
+        Legacy per-cell CSV cache files are folded in if the table does not
+        exist yet.
+        
+        Returns:
+            Mapping of (country_code, indicator_code) to cached value
+        """
+        with self._cache_lock:
+            if self._cache is not None:
+                return self._cache
+            
+            cache: Dict[Tuple[str, str], float] = {}
+            cache_path = self._get_cache_path()
+            if cache_path.exists():
+                try:
+                    cache_df = pd.read_parquet(cache_path, engine="pyarrow")
+                    cache = dict(zip(
+                        zip(cache_df["country_code"], cache_df["indicator_code"]),
+                        cache_df["value"].astype(float)
+                    ))
+                except Exception as e:
+                    print(f"Warning: Could not read WGI cache {cache_path}: {e}")
+            else:
+                for legacy_path in self.cache_dir.glob("wgi_*_*.csv"):
+                    _, country_code, indicator_code = legacy_path.stem.split("_", 2)
+                    try:
+                        legacy = pd.read_csv(legacy_path)
+                    except Exception:
+                        continue
+                    if legacy.empty:
+                        continue
+                    if "value" in legacy.columns:
+                        cache[(country_code, indicator_code)] = float(legacy["value"].iloc[0])
+                    else:
+                        cache[(country_code, indicator_code)] = float(legacy.iloc[0, -1])  # Last column
+                self._cache_dirty = bool(cache)
+            
+            self._cache = cache
+            return cache
+    
+    def _load_from_cache(self, country_code: str, indicator_code: str) -> Optional[float]:
+        """Load a value from cache if available."""
+        return self._load_cache().get((country_code, indicator_code))
     
-    def _save_to_cache(self, cache_path: Path, df: pd.DataFrame) -> None:
-        """Save data to cache."""
-        df.to_csv(cache_path, index=False)
+    def _save_to_cache(self, country_code: str, indicator_code: str, value: float) -> None:
+        """Save a value to the in-memory cache; written to disk by _flush_cache."""
+        cache = self._load_cache()
+        with self._cache_lock:
+            cache[(country_code, indicator_code)] = value
+            self._cache_dirty = True
+    
+    def _flush_cache(self) -> None:
+        """Write the cache table to disk if it changed."""
+        with self._cache_lock:
+            if not self._cache_dirty:
+                return
+            cache_df = pd.DataFrame(
+                [
+                    {"country_code": country_code, "indicator_code": indicator_code, "value": value}
+                    for (country_code, indicator_code), value in self._cache.items()
+                ],
+                columns=["country_code", "indicator_code", "value"]
+            )
+            cache_df.to_parquet(
+                self._get_cache_path(), engine="pyarrow", compression="zstd", index=False
+            )
+            self._cache_dirty = False
     
     def _fetch_indicator_api(
         self, 
@@ -89,6 +154,35 @@ class WGIClient:
             print(f"Error fetching WGI {indicator_code} for {country_code}: {e}")
             return None
     
+    def _get_indicator_value(
+        self,
+        country_code: str,
+        indicator_code: str,
+        year: int,
+        use_cache: bool
+    ) -> Optional[float]:
+        """
+        Get a WGI indicator value for one country, from cache or the API.
+        
+        Args:
+            country_code: ISO3 country code
+            indicator_code: WGI indicator code (e.g., RL.EST)
+            year: Target year
+            use_cache: Whether to use cached data
+            
+        Returns:
+            Indicator value or None
+        """
+        value = self._load_from_cache(country_code, indicator_code) if use_cache else None
+        
+        if value is None:
+            value = self._fetch_indicator_api(country_code, indicator_code, year)
+            if value is not None:
+                # Cache the result
+                self._save_to_cache(country_code, indicator_code, value)
+        
+        return value
+    
     def fetch_all_indicators(
         self, 
         country_codes: list,
@@ -98,44 +192,51 @@ class WGIClient:
         """
         Fetch WGI indicators for multiple countries.
         
+        Repeat calls with the same countries and year return a copy of the
+        earlier result without touching the cache or the API.
+        
         Args:
             country_codes: List of ISO3 country codes
             year: Target year
-            use_cache: Whether to use cached data
+            use_cache: Whether to use cached data (False also bypasses the
+                in-process result memo)
             
         Returns:
             DataFrame with WGI data
         """
-        results = []
+        memo_key = (tuple(country_codes), year)
+        if use_cache and memo_key in self._results:
+            return self._results[memo_key].copy()
+        
+        tasks = [
+            (country, indicator_name, indicator_code)
+            for country in country_codes
+            for indicator_name, indicator_code in self.WGI_INDICATORS.items()
+        ]
+        
+        # Requests are independent and IO-bound, so fetch them concurrently;
+        # map keeps results in task order
+        with ThreadPoolExecutor(max_workers=max(1, min(self.MAX_WORKERS, len(tasks)))) as executor:
+            values = list(executor.map(
+                lambda task: self._get_indicator_value(task[0], task[2], year, use_cache),
+                tasks
+            ))
+        self._flush_cache()
         
-        for country in country_codes:
-            for indicator_name, indicator_code in self.WGI_INDICATORS.items():
-                cache_path = self._get_cache_path(f"{country}_{indicator_code}")
-                
-                value = None
-                if use_cache:
-                    cached = self._load_from_cache(cache_path)
-                    if cached is not None and not cached.empty:
-                        if "value" in cached.columns:
-                            value = cached["value"].iloc[0]
-                        else:
-                            value = cached.iloc[0, -1]  # Last column
-                
-                if value is None:
-                    value = self._fetch_indicator_api(country, indicator_code, year)
-                    if value is not None:
-                        # Cache the result
-                        cache_df = pd.DataFrame({"country_code": [country], "value": [value]})
-                        self._save_to_cache(cache_path, cache_df)
-                
-                results.append({
-                    "country_code": country,
-                    "indicator": indicator_name,
-                    "value": value,
-                    "year": year
-                })
+        results = [
+            {
+                "country_code": country,
+                "indicator": indicator_name,
+                "value": value,
+                "year": year
+            }
+            for (country, indicator_name, _), value in zip(tasks, values)
+        ]
         
         df = pd.DataFrame(results)
+        # Only complete results are memoized so failed lookups are retried
+        if not df.empty and df["value"].notna().all():
+            self._results[memo_key] = df.copy()
         return df
 
 
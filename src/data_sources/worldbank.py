@@ -1,11 +1,14 @@
 """World Bank API V2 client for downloading economic indicators."""
 import os
 import json
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
-import requests
 import pandas as pd
 
+from src.data_sources._http import get_session
+
 
 class WorldBankClient:
     """Client for downloading World Bank indicators via API V2."""
@@ -16,29 +19,93 @@ class WorldBankClient:
         "gdp_per_capita": "NY.GDP.PCAP.CD",
         "internet_users_pct": "IT.NET.USER.ZS",
     }
+    MAX_WORKERS = len(INDICATORS)  # One batched all-country request in flight per indicator
     
     def __init__(self, cache_dir: str = "data/raw"):
         """Initialize client with cache directory."""
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": "APAC-Expansion-Engine/1.0"})
+        self.session = get_session()
+        self._cache: Optional[Dict[Tuple[str, str], Dict]] = None
+        self._cache_dirty = False
+        self._cache_lock = threading.Lock()
+        self._results: Dict[Tuple[Tuple[str, ...], int], pd.DataFrame] = {}
     
-    def _get_cache_path(self, country_code: str, indicator_code: str) -> Path:
-        """Get cache file path for indicator."""
-        return self.cache_dir / f"wb_{country_code}_{indicator_code}.json"
+    def _get_cache_path(self) -> Path:
+        """Get path of the single cache table for all indicators."""
+        return self.cache_dir / "wb_cache.parquet"
     
-    def _load_from_cache(self, cache_path: Path) -> Optional[Dict]:
+    def _load_cache(self) -> Dict[Tuple[str, str], Dict]:
+        """
+        Load the cache table into memory on first use.
+        
+        Legacy per-cell JSON cache files are folded in if the table does not
+        exist yet.
+        
+        Returns:
+            Mapping of (country_code, indicator_code) to cached value and year
+        """
+        with self._cache_lock:
+            if self._cache is not None:
+                return self._cache
+            
+            cache: Dict[Tuple[str, str], Dict] = {}
+            cache_path = self._get_cache_path()
+            if cache_path.exists():
+                try:
+                    cache_df = pd.read_parquet(cache_path, engine="pyarrow")
+                    for row in cache_df.itertuples(index=False):
+                        cache[(row.country_code, row.indicator_code)] = {
+                            "value": row.value,
+                            "year": row.year
+                        }
+                except Exception as e:
+                    print(f"Warning: Could not read World Bank cache {cache_path}: {e}")
+            else:
+                for legacy_path in self.cache_dir.glob("wb_*_*.json"):
+                    _, country_code, indicator_code = legacy_path.stem.split("_", 2)
+                    try:
+                        with open(legacy_path, "r") as f:
+                            cache[(country_code, indicator_code)] = json.load(f)
+                    except Exception:
+                        continue
+                self._cache_dirty = bool(cache)
+            
+            self._cache = cache
+            return cache
+    
+    def _load_from_cache(self, country_code: str, indicator_code: str) -> Optional[Dict]:
         """Load data from cache if available."""
-        if cache_path.exists():
-            with open(cache_path, "r") as f:
-                return json.load(f)
-        return None
+        return self._load_cache().get((country_code, indicator_code))
+    
+    def _save_to_cache(self, country_code: str, indicator_code: str, data: Dict) -> None:
+        """Save data to the in-memory cache; written to disk by _flush_cache."""
+        cache = self._load_cache()
+        with self._cache_lock:
+            cache[(country_code, indicator_code)] = data
+            self._cache_dirty = True
     
-    def _save_to_cache(self, cache_path: Path, data: Dict) -> None:
-        """Save data to cache."""
-        with open(cache_path, "w") as f:
-            json.dump(data, f)
+    def _flush_cache(self) -> None:
+        """Write the cache table to disk if it changed."""
+        with self._cache_lock:
+            if not self._cache_dirty:
+                return
+            cache_df = pd.DataFrame(
+                [
+                    {
+                        "country_code": country_code,
+                        "indicator_code": indicator_code,
+                        "value": None if data.get("value") is None else float(data["value"]),
+                        "year": None if data.get("year") is None else str(data["year"])
+                    }
+                    for (country_code, indicator_code), data in self._cache.items()
+                ],
+                columns=["country_code", "indicator_code", "value", "year"]
+            )
+            cache_df.to_parquet(
+                self._get_cache_path(), engine="pyarrow", compression="zstd", index=False
+            )
+            self._cache_dirty = False
     
     def _fetch_indicator(
         self, 
@@ -59,14 +126,50 @@ class WorldBankClient:
         Returns:
             Latest available value or None if not found
         """
-        cache_path = self._get_cache_path(country_code, indicator_code)
+        values = self._fetch_indicator_batch([country_code], indicator_code, year, use_cache)
+        self._flush_cache()
+        return values[country_code]
+    
+    def _fetch_indicator_batch(
+        self,
+        country_codes: List[str],
+        indicator_code: str,
+        year: int = 2022,
+        use_cache: bool = True
+    ) -> Dict[str, Optional[float]]:
+        """
+        Fetch latest available indicator values for several countries at once.
+        
+        Countries without a cached value are requested together in a single
+        call using the API's ';'-separated country list. If the API rejects
+        the batch (e.g. one invalid code), each country is retried on its
+        own. Values are still cached per (country, indicator).
         
-        if use_cache:
-            cached = self._load_from_cache(cache_path)
+        Args:
+            country_codes: ISO3 country codes
+            indicator_code: World Bank indicator code
+            year: Target year (default 2022)
+            use_cache: Whether to use cached data
+            
+        Returns:
+            Mapping of country code to latest value (None if not found)
+        """
+        values: Dict[str, Optional[float]] = {}
+        to_fetch = []
+        for country_code in dict.fromkeys(country_codes):
+            cached = None
+            if use_cache:
+                cached = self._load_from_cache(country_code, indicator_code)
             if cached and "value" in cached:
-                return cached["value"]
+                values[country_code] = cached["value"]
+            else:
+                values[country_code] = None
+                to_fetch.append(country_code)
         
-        url = f"{self.BASE_URL}/{country_code}/indicator/{indicator_code}"
+        if not to_fetch:
+            return values
+        
+        url = f"{self.BASE_URL}/{';'.join(to_fetch)}/indicator/{indicator_code}"
         params = {
             "format": "json",
             "date": f"{year-5}:{year}",  # Get last 5 years
@@ -78,50 +181,92 @@ class WorldBankClient:
             response.raise_for_status()
             data = response.json()
             
+            # One invalid code makes the API answer the whole batch with an
+            # error message; retry one country per request so only it is lost
+            if data and isinstance(data[0], dict) and "message" in data[0]:
+                if len(to_fetch) > 1:
+                    for country_code in to_fetch:
+                        values.update(self._fetch_indicator_batch(
+                            [country_code], indicator_code, year, use_cache=False
+                        ))
+                    return values
+                print(f"Error fetching {indicator_code} for {to_fetch[0]}: {data[0]['message']}")
+                return values
+            
             if len(data) < 2 or not data[1]:
-                return None
+                return values
             
-            # Get most recent non-null value
-            for item in sorted(data[1], key=lambda x: x.get("date", ""), reverse=True):
-                value = item.get("value")
-                if value is not None:
-                    self._save_to_cache(cache_path, {"value": value, "year": item.get("date")})
-                    return float(value)
+            # Get most recent non-null value per country
+            raw = pd.DataFrame.from_records(data[1], columns=["countryiso3code", "date", "value"])
+            raw = raw[raw["countryiso3code"].isin(to_fetch)].dropna(subset=["value"])
+            latest = raw.sort_values("date", kind="stable").groupby("countryiso3code").tail(1)
             
-            return None
+            for country_code, date, value in latest.itertuples(index=False, name=None):
+                self._save_to_cache(
+                    country_code,
+                    indicator_code,
+                    {"value": float(value), "year": date}
+                )
+                values[country_code] = float(value)
+            
+            return values
             
         except Exception as e:
-            print(f"Error fetching {indicator_code} for {country_code}: {e}")
-            return None
+            print(f"Error fetching {indicator_code} for {', '.join(to_fetch)}: {e}")
+            return values
     
     def fetch_all_indicators(
         self, 
         country_codes: List[str], 
-        year: int = 2022
+        year: int = 2022,
+        use_cache: bool = True
     ) -> pd.DataFrame:
         """
         Fetch all indicators for multiple countries.
         
+        Repeat calls with the same countries and year return a copy of the
+        earlier result without touching the cache or the API.
+        
         Args:
             country_codes: List of ISO3 country codes
             year: Target year
+            use_cache: Whether to use cached data (False also bypasses the
+                in-process result memo)
             
         Returns:
             DataFrame with country, indicator, and value columns
         """
-        results = []
+        memo_key = (tuple(country_codes), year)
+        if use_cache and memo_key in self._results:
+            return self._results[memo_key].copy()
+        
+        # One batched request per indicator covers every country; the
+        # indicators are independent, so fetch them concurrently
+        indicator_codes = list(self.INDICATORS.values())
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            batches = dict(zip(indicator_codes, executor.map(
+                lambda indicator_code: self._fetch_indicator_batch(
+                    country_codes, indicator_code, year, use_cache
+                ),
+                indicator_codes
+            )))
+        self._flush_cache()
         
-        for country in country_codes:
-            for indicator_name, indicator_code in self.INDICATORS.items():
-                value = self._fetch_indicator(country, indicator_code, year)
-                results.append({
-                    "country_code": country,
-                    "indicator": indicator_name,
-                    "value": value,
-                    "year": year
-                })
+        results = [
+            {
+                "country_code": country,
+                "indicator": indicator_name,
+                "value": batches[indicator_code][country],
+                "year": year
+            }
+            for country in country_codes
+            for indicator_name, indicator_code in self.INDICATORS.items()
+        ]
         
         df = pd.DataFrame(results)
+        # Only complete results are memoized so failed lookups are retried
+        if not df.empty and df["value"].notna().all():
+            self._results[memo_key] = df.copy()
         return df
 
 
@@ -1,27 +1,33 @@
 """Feature engineering pipeline: clean, transform, and standardize market data."""
-from typing import Dict, List
+from typing import List
 from pathlib import Path
 import pandas as pd
 import numpy as np
 
 
-def load_raw_data(data_dir: str = "data/raw") -> Dict[str, pd.DataFrame]:
+def _pivot_indicators(data: pd.DataFrame) -> pd.DataFrame:
     """
-    Load all raw data files.
+    Pivot long indicator data to one row per country.
+    
+    Equivalent to pivot_table(aggfunc="first"): the first non-null value of
+    each (country, indicator) pair is kept, and all-missing rows/columns are
+    dropped.
     
     Args:
-        data_dir: Directory containing raw data
+        data: Long format DataFrame with country_code, indicator and value
         
     Returns:
-        Dictionary of DataFrames by source
+        Wide DataFrame with a country_code column and one column per indicator
     """
-    data_path = Path(data_dir)
-    data_dict = {}
-    
-    # This will be called after data download, so we look for processed raw files
-    # or we can load from API results that were saved
-    
-    return data_dict
+    pivot = (
+        data.dropna(subset=["value"])
+        .drop_duplicates(subset=["country_code", "indicator"], keep="first")
+        .set_index(["country_code", "indicator"])["value"]
+        .unstack("indicator")
+        .reset_index()
+    )
+    pivot.columns.name = None
+    return pivot
 
 
 def combine_data_sources(
@@ -41,30 +47,16 @@ def combine_data_sources(
         Combined DataFrame with one row per country
     """
     # Pivot World Bank data
-    wb_pivot = wb_data.pivot_table(
-        index="country_code",
-        columns="indicator",
-        values="value",
-        aggfunc="first"
-    ).reset_index()
-    
-    # Rename columns
-    wb_pivot.columns.name = None
-    if "population" in wb_pivot.columns:
-        wb_pivot = wb_pivot.rename(columns={"population": "population_total"})
-    if "gdp_per_capita" in wb_pivot.columns:
-        wb_pivot = wb_pivot.rename(columns={"gdp_per_capita": "gdp_per_capita_usd"})
-    if "internet_users_pct" in wb_pivot.columns:
-        wb_pivot = wb_pivot.rename(columns={"internet_users_pct": "internet_users_pct"})
+    wb_pivot = _pivot_indicators(wb_data)
+    
+    # Rename columns (absent indicators are skipped by rename)
+    wb_pivot = wb_pivot.rename(columns={
+        "population": "population_total",
+        "gdp_per_capita": "gdp_per_capita_usd"
+    })
     
     # Pivot WGI data
-    wgi_pivot = wgi_data.pivot_table(
-        index="country_code",
-        columns="indicator",
-        values="value",
-        aggfunc="first"
-    ).reset_index()
-    wgi_pivot.columns.name = None
+    wgi_pivot = _pivot_indicators(wgi_data)
     
     # Merge all data
     df = wb_pivot.merge(wgi_pivot, on="country_code", how="outer")
@@ -73,67 +65,83 @@ def combine_data_sources(
     return df
 
 
-def handle_missing_data(df: pd.DataFrame, strategy: str = "median") -> pd.DataFrame:
+def handle_missing_data(
+    df: pd.DataFrame,
+    strategy: str = "median",
+    copy: bool = True
+) -> pd.DataFrame:
     """
     Handle missing values in market data.
     
     Args:
         df: Input DataFrame
         strategy: Imputation strategy ('median', 'mean', 'forward_fill', 'drop')
+        copy: Work on a copy instead of filling df in place
         
     Returns:
         DataFrame with missing values handled
     """
-    df = df.copy()
+    if copy:
+        df = df.copy()
     numeric_cols = df.select_dtypes(include=[np.number]).columns
+    fill_cols = numeric_cols.drop("country_code", errors="ignore")
     
+    # Column statistics are computed once and aligned by column name
     if strategy == "median":
-        for col in numeric_cols:
-            if col != "country_code":
-                df[col] = df[col].fillna(df[col].median())
+        df[fill_cols] = df[fill_cols].fillna(df[fill_cols].median())
     elif strategy == "mean":
-        for col in numeric_cols:
-            if col != "country_code":
-                df[col] = df[col].fillna(df[col].mean())
+        df[fill_cols] = df[fill_cols].fillna(df[fill_cols].mean())
     elif strategy == "forward_fill":
-        df[numeric_cols] = df[numeric_cols].fillna(method="ffill")
+        df[numeric_cols] = df[numeric_cols].ffill()
     elif strategy == "drop":
         df = df.dropna(subset=numeric_cols)
     
     return df
 
 
-def standardize_features(df: pd.DataFrame, method: str = "zscore") -> pd.DataFrame:
+def standardize_features(
+    df: pd.DataFrame,
+    method: str = "zscore",
+    copy: bool = True
+) -> pd.DataFrame:
     """
     Standardize features using z-scores or min-max scaling.
     
     Args:
         df: Input DataFrame with features
         method: Standardization method ('zscore' or 'minmax')
+        copy: Work on a copy instead of adding columns to df in place
         
     Returns:
         DataFrame with standardized features
     """
-    df = df.copy()
+    if copy:
+        df = df.copy()
     numeric_cols = [col for col in df.columns 
                     if col != "country_code" and pd.api.types.is_numeric_dtype(df[col])]
     
+    if not numeric_cols:
+        return df
+    
+    # Column statistics in one pass, then broadcast over the whole block
+    values = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
     if method == "zscore":
-        for col in numeric_cols:
-            mean = df[col].mean()
-            std = df[col].std()
-            if std > 0:
-                df[f"{col}_standardized"] = (df[col] - mean) / std
-            else:
-                df[f"{col}_standardized"] = 0
+        center = df[numeric_cols].mean().to_numpy(dtype=np.float64)
+        scale = df[numeric_cols].std().to_numpy(dtype=np.float64)
     elif method == "minmax":
-        for col in numeric_cols:
-            min_val = df[col].min()
-            max_val = df[col].max()
-            if max_val > min_val:
-                df[f"{col}_standardized"] = (df[col] - min_val) / (max_val - min_val)
-            else:
-                df[f"{col}_standardized"] = 0
+        center = df[numeric_cols].min().to_numpy(dtype=np.float64)
+        scale = df[numeric_cols].max().to_numpy(dtype=np.float64) - center
+    else:
+        return df
+    
+    # Constant (or all-NaN / single-row) columns standardize to an integer 0
+    valid = scale > 0
+    standardized = np.where(valid, (values - center) / np.where(valid, scale, 1.0), 0.0)
+    std_cols = [f"{col}_standardized" for col in numeric_cols]
+    df[std_cols] = standardized
+    for col, is_valid in zip(std_cols, valid):
+        if not is_valid:
+            df[col] = 0
     
     return df
 
@@ -160,33 +168,40 @@ def build_feature_set(
     df = combine_data_sources(wb_data, wgi_data, cpi_data)
     
     # Handle missing data
-    df = handle_missing_data(df, strategy="median")
+    # df is a fresh frame from merge, so the stages can skip their defensive
+    # copies; filling it in place never reaches the callers' inputs, with or
+    # without copy-on-write
+    df = handle_missing_data(df, strategy="median", copy=False)
+    
+    # Create composite features (collected first, inserted in one assign)
+    composite = {}
     
-    # Create composite features
     # Market size score (log of population for better distribution)
     if "population_total" in df.columns:
-        df["market_size_score"] = np.log1p(df["population_total"])  # log(1+x) handles zeros
+        composite["market_size_score"] = np.log1p(df["population_total"])  # log(1+x) handles zeros
     
     # Purchasing power = GDP per capita (already in dataset)
     if "gdp_per_capita_usd" in df.columns:
-        df["purchasing_power_score"] = df["gdp_per_capita_usd"]
+        composite["purchasing_power_score"] = df["gdp_per_capita_usd"]
     
     # Digital readiness = internet users %
     if "internet_users_pct" in df.columns:
-        df["digital_readiness_score"] = df["internet_users_pct"]
+        composite["digital_readiness_score"] = df["internet_users_pct"]
     
     # Governance risk = inverse of rule_of_law + regulatory_quality (lower is worse)
     if "rule_of_law" in df.columns and "regulatory_quality" in df.columns:
         # WGI ranges from -2.5 to +2.5, so we invert to make higher = better
-        df["governance_risk_score"] = (df["rule_of_law"] + df["regulatory_quality"]) / 2
+        composite["governance_risk_score"] = (df["rule_of_law"] + df["regulatory_quality"]) / 2
     elif "rule_of_law" in df.columns:
-        df["governance_risk_score"] = df["rule_of_law"]
+        composite["governance_risk_score"] = df["rule_of_law"]
     elif "regulatory_quality" in df.columns:
-        df["governance_risk_score"] = df["regulatory_quality"]
+        composite["governance_risk_score"] = df["regulatory_quality"]
     
     # Corruption risk = CPI (higher is better, 0-100)
     if "cpi_score" in df.columns:
-        df["corruption_risk_score"] = df["cpi_score"]
+        composite["corruption_risk_score"] = df["cpi_score"]
+    
+    df = df.assign(**composite)
     
     # Standardize all feature scores
     feature_cols = [
@@ -198,18 +213,27 @@ def build_feature_set(
     ]
     
     # Standardize each feature
-    df = standardize_features(df, method="zscore")
+    df = standardize_features(df, method="zscore", copy=False)
     
     # Ensure all standardized features exist (fill with 0 if missing)
-    for col in feature_cols:
-        std_col = f"{col}_standardized"
-        if std_col not in df.columns:
-            df[std_col] = 0
+    missing_std = {
+        f"{col}_standardized": 0
+        for col in feature_cols
+        if f"{col}_standardized" not in df.columns
+    }
+    if missing_std:
+        df = df.assign(**missing_std)
     
     # Save processed data
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     df.to_csv(output_path / "market_features.csv", index=False)
     
+    # Columnar copy for the dashboard (standardized features as float32)
+    std_cols = [f"{col}_standardized" for col in feature_cols]
+    df.astype({col: "float32" for col in std_cols}).to_parquet(
+        output_path / "market_features.parquet", engine="pyarrow", index=False
+    )
+    
     return df
 
@@ -4,6 +4,7 @@ from pathlib import Path
 import yaml
 import pandas as pd
 import pickle
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 
 # Add src to path
@@ -15,7 +16,7 @@ from src.data_sources.owid import OWIDClient
 from src.features.build_features import build_feature_set
 from src.models.scoring import MarketScorer, run_full_sensitivity
 from src.models.forecast import generate_scenarios, RevenueForecaster
-from src.models.monte_carlo import MonteCarloSimulator
+from src.models.monte_carlo import MonteCarloSimulator, arrays_to_long
 from src.reporting.make_slides import create_presentation
 
 
@@ -25,6 +26,12 @@ def load_config(config_path: str) -> Dict:
         return yaml.safe_load(f)
 
 
+def _dump_pickle(obj, path: Path) -> None:
+    """Pickle obj to path."""
+    with open(path, "wb") as f:
+        pickle.dump(obj, f)
+
+
 def main():
     """Main pipeline execution."""
     print("=" * 60)
@@ -80,88 +87,105 @@ def main():
     # Save scoring results
     outputs_dir = Path("outputs")
     outputs_dir.mkdir(exist_ok=True)
-    scored_df.to_csv(outputs_dir / "market_scores.csv", index=False)
-    print(f"  Top 3 markets: {', '.join(scored_df.head(3)['country_code'].tolist())}")
-    
-    # Step 4: Run sensitivity analysis
-    print("\n[5/7] Running sensitivity analysis...")
-    sensitivity_config = weights_config.get("sensitivity", {})
-    sensitivity_results = run_full_sensitivity(
-        features_df,
-        weights,
-        step=sensitivity_config.get("step", 0.05),
-        n_runs=sensitivity_config.get("runs", 200)
-    )
-    print(f"  Completed sensitivity for {len(sensitivity_results)} criteria")
-    
-    # Step 5: Generate forecasts and Monte Carlo
-    print("\n[6/7] Running revenue forecasts and Monte Carlo simulation...")
-    
-    # Get top market for detailed analysis
-    top_market = scored_df.iloc[0]
-    market_adjustment = (top_market["total_score"] + 3) / 6  # Rough normalization
-    market_adjustment = max(0.5, min(1.5, market_adjustment))
-    
-    # Generate scenarios
-    forecast_scenarios = generate_scenarios(
-        assumptions_config,
-        market_adjustment=market_adjustment,
-        months=assumptions_config["simulation"]["months"]
-    )
-    
-    # Run Monte Carlo for top market
-    simulator = MonteCarloSimulator(assumptions_config)
-    sim_results, sim_summary = simulator.simulate_revenue(
-        months=assumptions_config["simulation"]["months"],
-        n_sims=assumptions_config["simulation"]["n_sims"],
-        market_adjustment=market_adjustment
-    )
-    
-    # Calculate payback distribution
-    entry_cost = assumptions_config["costs"]["market_entry_cost_usd"]
-    payback_df, payback_stats = simulator.calculate_payback_distribution(
-        sim_results,
-        entry_cost=entry_cost
-    )
-    
-    print(f"  Monte Carlo results:")
-    print(f"    Mean payback: {payback_stats.get('mean', -1):.1f} months")
-    print(f"    Never pays back: {payback_stats.get('never_pays_back_pct', 0):.1f}% of simulations")
-    
-    # Save simulation results
-    sim_results.to_csv(outputs_dir / "monte_carlo_results.csv", index=False)
-    sim_summary.to_csv(outputs_dir / "monte_carlo_summary.csv", index=False)
-    payback_df.to_csv(outputs_dir / "payback_distribution.csv", index=False)
     
-    # Step 6: Prepare dashboard data
-    print("\n[7/7] Preparing outputs...")
-    
-    # Save data for dashboard
-    dashboard_data = {
-        "market_features": features_df,
-        "market_scores": scored_df,
-        "sensitivity": sensitivity_results,
-        "forecasts": forecast_scenarios,
-        "monte_carlo": {
-            "results": sim_results,
-            "summary": sim_summary,
-            "payback_stats": payback_stats
+    # Output files are written in the background while the pipeline runs;
+    # all writes are awaited (and the pool shut down) before main() returns
+    with ThreadPoolExecutor(max_workers=4) as io_pool:
+        pending_writes = [
+            io_pool.submit(scored_df.to_csv, outputs_dir / "market_scores.csv", index=False)
+        ]
+        print(f"  Top 3 markets: {', '.join(scored_df.head(3)['country_code'].tolist())}")
+        
+        # Step 4: Run sensitivity analysis
+        print("\n[5/7] Running sensitivity analysis...")
+        sensitivity_config = weights_config.get("sensitivity", {})
+        sensitivity_results = run_full_sensitivity(
+            features_df,
+            weights,
+            step=sensitivity_config.get("step", 0.05),
+            n_runs=sensitivity_config.get("runs", 200)
+        )
+        print(f"  Completed sensitivity for {len(sensitivity_results)} criteria")
+        
+        # Step 5: Generate forecasts and Monte Carlo
+        print("\n[6/7] Running revenue forecasts and Monte Carlo simulation...")
+        
+        # Get top market for detailed analysis
+        top_market = scored_df.iloc[0]
+        market_adjustment = (top_market["total_score"] + 3) / 6  # Rough normalization
+        market_adjustment = max(0.5, min(1.5, market_adjustment))
+        
+        # Generate scenarios
+        forecast_scenarios = generate_scenarios(
+            assumptions_config,
+            market_adjustment=market_adjustment,
+            months=assumptions_config["simulation"]["months"]
+        )
+        
+        # Run Monte Carlo for top market
+        simulator = MonteCarloSimulator(assumptions_config)
+        sim_arrays, sim_summary = simulator.simulate_revenue_arrays(
+            months=assumptions_config["simulation"]["months"],
+            n_sims=assumptions_config["simulation"]["n_sims"],
+            market_adjustment=market_adjustment
+        )
+        
+        # Calculate payback distribution
+        entry_cost = assumptions_config["costs"]["market_entry_cost_usd"]
+        payback_df, payback_stats = simulator.calculate_payback_distribution(
+            sim_arrays["net_revenue"],
+            entry_cost=entry_cost
+        )
+        
+        print(f"  Monte Carlo results:")
+        print(f"    Mean payback: {payback_stats.get('mean', -1):.1f} months")
+        print(f"    Never pays back: {payback_stats.get('never_pays_back_pct', 0):.1f}% of simulations")
+        
+        # Save simulation results (long format only materialized for output)
+        sim_results = arrays_to_long(sim_arrays)
+        pending_writes += [
+            io_pool.submit(
+                sim_results.to_parquet, outputs_dir / "monte_carlo_results.parquet",
+                engine="pyarrow", compression="snappy", index=False
+            ),
+            io_pool.submit(sim_summary.to_csv, outputs_dir / "monte_carlo_summary.csv", index=False),
+            io_pool.submit(payback_df.to_csv, outputs_dir / "payback_distribution.csv", index=False)
+        ]
+        
+        # Step 6: Prepare dashboard data
+        print("\n[7/7] Preparing outputs...")
+        
+        # Save data for dashboard
+        dashboard_data = {
+            "market_features": features_df,
+            "market_scores": scored_df,
+            "sensitivity": sensitivity_results,
+            "forecasts": forecast_scenarios,
+            "monte_carlo": {
+                "results": sim_results,
+                "summary": sim_summary,
+                "payback_stats": payback_stats
+            }
         }
-    }
-    
-    with open(outputs_dir / "dashboard_data.pkl", "wb") as f:
-        pickle.dump(dashboard_data, f)
-    
-    # Step 7: Generate PowerPoint
-    print("  Generating PowerPoint presentation...")
-    create_presentation(
-        market_scores=scored_df,
-        sensitivity_results=sensitivity_results,
-        forecast_scenarios=forecast_scenarios,
-        monte_carlo_stats=payback_stats,
-        assumptions=assumptions_config,
-        output_path=str(outputs_dir / "apac_expansion_recommendations.pptx")
-    )
+        
+        pending_writes.append(
+            io_pool.submit(_dump_pickle, dashboard_data, outputs_dir / "dashboard_data.pkl")
+        )
+        
+        # Step 7: Generate PowerPoint
+        print("  Generating PowerPoint presentation...")
+        create_presentation(
+            market_scores=scored_df,
+            sensitivity_results=sensitivity_results,
+            forecast_scenarios=forecast_scenarios,
+            monte_carlo_stats=payback_stats,
+            assumptions=assumptions_config,
+            output_path=str(outputs_dir / "apac_expansion_recommendations.pptx")
+        )
+        
+        # Wait for the background writes (re-raises any write error)
+        for future in pending_writes:
+            future.result()
     
     print("\n" + "=" * 60)
     print("Pipeline completed successfully!")
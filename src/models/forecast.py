@@ -4,6 +4,40 @@ import pandas as pd
 import numpy as np
 
 
+# Scenario multipliers: (lead_to_opp, opp_to_win, monthly_churn, market_adjustment)
+SCENARIO_ADJUSTMENTS: Dict[str, Tuple[float, float, float, float]] = {
+    "optimistic": (1.2, 1.2, 0.8, 1.15),
+    "pessimistic": (0.8, 0.8, 1.2, 0.85)
+}
+
+
+def _apply_scenario(base_params: Dict, scenario: str, market_adjustment: float) -> Dict:
+    """
+    Apply scenario and market adjustments to base forecast parameters.
+    
+    Args:
+        base_params: Base parameters from RevenueForecaster._base_params
+        scenario: Scenario type ('base', 'optimistic', 'pessimistic')
+        market_adjustment: Multiplier for market size/readiness
+        
+    Returns:
+        Parameters for RevenueForecaster._forecast_from_params
+    """
+    params = dict(base_params)
+    
+    # Apply scenario adjustments (unknown scenarios use the base values)
+    if scenario in SCENARIO_ADJUSTMENTS:
+        lead_mult, win_mult, churn_mult, market_mult = SCENARIO_ADJUSTMENTS[scenario]
+        params["lead_to_opp"] *= lead_mult
+        params["opp_to_win"] *= win_mult
+        params["monthly_churn"] *= churn_mult
+        market_adjustment *= market_mult
+    
+    # Apply market adjustment
+    params["leads_per_month"] = int(params["leads_per_month"] * market_adjustment)
+    return params
+
+
 class RevenueForecaster:
     """Forecasts revenue based on market assumptions and funnel metrics."""
     
@@ -37,82 +71,90 @@ class RevenueForecaster:
         Returns:
             DataFrame with monthly forecasts
         """
-        # Get base assumptions
-        leads_per_month = self.funnel.get("leads_per_month_initial", 120)
-        lead_to_opp = self.funnel.get("lead_to_opportunity", 0.18)
-        opp_to_win = self.funnel.get("opportunity_to_win", 0.22)
-        sales_cycle = self.funnel.get("sales_cycle_months", 2)
-        acv = self.commercial.get("acv_usd", 18000)
-        monthly_churn = self.retention.get("monthly_churn", 0.018)
+        params = _apply_scenario(self._base_params(), scenario, market_adjustment)
+        return self._forecast_from_params(months=months, **params)
+    
+    def _base_params(self) -> Dict:
+        """Read the base funnel, retention and cost assumptions once."""
+        return {
+            "leads_per_month": self.funnel.get("leads_per_month_initial", 120),
+            "lead_to_opp": self.funnel.get("lead_to_opportunity", 0.18),
+            "opp_to_win": self.funnel.get("opportunity_to_win", 0.22),
+            "sales_cycle": self.funnel.get("sales_cycle_months", 2),
+            "acv": self.commercial.get("acv_usd", 18000),
+            "monthly_churn": self.retention.get("monthly_churn", 0.018),
+            "cac": self.costs.get("cac_usd_per_customer", 14000),
+            "gross_margin": self.commercial.get("gross_margin", 0.82)
+        }
+    
+    @staticmethod
+    def _forecast_from_params(
+        leads_per_month: int,
+        lead_to_opp: float,
+        opp_to_win: float,
+        sales_cycle: int,
+        acv: float,
+        monthly_churn: float,
+        cac: float,
+        gross_margin: float,
+        months: int = 12
+    ) -> pd.DataFrame:
+        """
+        Forecast monthly revenue from already scenario-adjusted parameters.
         
-        # Apply scenario adjustments
-        if scenario == "optimistic":
-            lead_to_opp *= 1.2
-            opp_to_win *= 1.2
-            monthly_churn *= 0.8
-            market_adjustment *= 1.15
-        elif scenario == "pessimistic":
-            lead_to_opp *= 0.8
-            opp_to_win *= 0.8
-            monthly_churn *= 1.2
-            market_adjustment *= 0.85
+        Args:
+            leads_per_month: Market-adjusted leads per month
+            lead_to_opp: Lead-to-opportunity rate
+            opp_to_win: Opportunity-to-win rate
+            sales_cycle: First month in which leads convert
+            acv: Annual contract value
+            monthly_churn: Monthly churn rate
+            cac: Customer acquisition cost
+            gross_margin: Gross margin applied to revenue
+            months: Number of months to forecast
+            
+        Returns:
+            DataFrame with monthly forecasts
+        """
+        month = np.arange(1, months + 1)
+        converting = month >= sales_cycle
         
-        # Apply market adjustment
-        leads_per_month = int(leads_per_month * market_adjustment)
+        # New leads, opportunities and wins (with sales cycle lag)
+        new_leads = np.full(months, leads_per_month)
+        new_opportunities = np.where(converting, int(leads_per_month * lead_to_opp), 0)
+        new_wins = np.where(converting, int(leads_per_month * lead_to_opp * opp_to_win), 0)
         
-        # Initialize tracking
-        results = []
-        active_customers = 0
-        total_acquisition_cost = 0
+        # Apply churn to existing customers (whole customers churn, so the
+        # floor makes this a recurrence over months)
+        churned = np.zeros(months, dtype=np.int64)
+        active_customers = np.zeros(months, dtype=np.int64)
+        active = 0
+        for i, wins in enumerate(new_wins.tolist()):
+            lost = int(active * monthly_churn)
+            active = max(0, active - lost + wins)
+            churned[i] = lost
+            active_customers[i] = active
         
-        for month in range(1, months + 1):
-            # New leads
-            new_leads = leads_per_month
-            
-            # Convert to opportunities (with sales cycle lag)
-            if month >= sales_cycle:
-                opps_from_month = new_leads * lead_to_opp
-            else:
-                opps_from_month = 0
-            
-            # Convert to wins
-            if month >= sales_cycle:
-                new_wins = int(opps_from_month * opp_to_win)
-            else:
-                new_wins = 0
-            
-            # Apply churn to existing customers
-            churned = int(active_customers * monthly_churn)
-            active_customers = max(0, active_customers - churned + new_wins)
-            
-            # Calculate revenue
-            monthly_revenue = active_customers * (acv / 12)  # Monthly ACV
-            
-            # Track costs
-            cac = self.costs.get("cac_usd_per_customer", 14000)
-            acquisition_cost = new_wins * cac
-            total_acquisition_cost += acquisition_cost
-            
-            # Net revenue (after gross margin)
-            gross_margin = self.commercial.get("gross_margin", 0.82)
-            gross_revenue = monthly_revenue * gross_margin
-            
-            results.append({
-                "month": month,
-                "new_leads": new_leads,
-                "new_opportunities": int(opps_from_month) if month >= sales_cycle else 0,
-                "new_wins": new_wins,
-                "churned": churned,
-                "active_customers": active_customers,
-                "monthly_revenue": monthly_revenue,
-                "gross_revenue": gross_revenue,
-                "acquisition_cost": acquisition_cost,
-                "cumulative_acquisition_cost": total_acquisition_cost,
-                "net_revenue": gross_revenue - acquisition_cost,
-                "cumulative_net_revenue": sum(r["net_revenue"] for r in results) + (gross_revenue - acquisition_cost)
-            })
+        # Calculate revenue (monthly ACV) and costs
+        monthly_revenue = active_customers * (acv / 12)
+        gross_revenue = monthly_revenue * gross_margin
+        acquisition_cost = new_wins * cac
+        net_revenue = gross_revenue - acquisition_cost
         
-        df = pd.DataFrame(results)
+        df = pd.DataFrame({
+            "month": month,
+            "new_leads": new_leads,
+            "new_opportunities": new_opportunities,
+            "new_wins": new_wins,
+            "churned": churned,
+            "active_customers": active_customers,
+            "monthly_revenue": monthly_revenue,
+            "gross_revenue": gross_revenue,
+            "acquisition_cost": acquisition_cost,
+            "cumulative_acquisition_cost": np.cumsum(acquisition_cost),
+            "net_revenue": net_revenue,
+            "cumulative_net_revenue": np.cumsum(net_revenue)
+        })
         return df
     
     def calculate_payback_period(
@@ -158,14 +200,12 @@ def generate_scenarios(
         Dictionary of scenario forecasts
     """
     forecaster = RevenueForecaster(assumptions)
+    base_params = forecaster._base_params()
     
     scenarios = {}
     for scenario in ["base", "optimistic", "pessimistic"]:
-        forecast = forecaster.forecast_revenue(
-            months=months,
-            market_adjustment=market_adjustment,
-            scenario=scenario
-        )
+        params = _apply_scenario(base_params, scenario, market_adjustment)
+        forecast = forecaster._forecast_from_params(months=months, **params)
         scenarios[scenario] = forecast
     
     return scenarios
@@ -4,6 +4,95 @@ import pandas as pd
 import numpy as np
 
 
+def _simulate_core(
+    base_leads: float,
+    lead_to_opp: np.ndarray,
+    opp_to_win: np.ndarray,
+    churn_rate: np.ndarray,
+    cac: np.ndarray,
+    acv: float,
+    gross_margin: float,
+    sales_cycle: int,
+    months: int,
+    rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Step the customer funnel month by month for all simulations at once.
+    
+    Each month is one set of array operations over the simulations, so the
+    only Python-level loop is over the forecast horizon.
+    
+    Args:
+        base_leads: Expected leads per month (Poisson mean)
+        lead_to_opp: Per-simulation lead-to-opportunity rates
+        opp_to_win: Per-simulation opportunity-to-win rates
+        churn_rate: Per-simulation monthly churn rates
+        cac: Per-simulation customer acquisition costs
+        acv: Annual contract value
+        gross_margin: Gross margin applied to revenue
+        sales_cycle: First month in which leads convert
+        months: Forecast horizon in months
+        rng: Random generator used for the lead, win and churn draws
+        
+    Returns:
+        Tuple of (active_customers, monthly_revenue, cumulative_revenue,
+        cumulative_cost, net_revenue) arrays, each shaped (months, n_sims)
+    """
+    n_sims = len(lead_to_opp)
+    active_out = np.empty((months, n_sims), dtype=np.int64)
+    
+    # Generate leads for every simulation-month up front (add some noise)
+    leads = rng.poisson(base_leads, size=(months, n_sims))
+    
+    # Convert to opportunities and wins; wins do not depend on the customer
+    # base, so every month is drawn at once and the sales cycle lag is a mask
+    converting = (np.arange(1, months + 1) >= sales_cycle)[:, None]
+    opps = np.where(converting, (leads * lead_to_opp).astype(np.int64), 0)
+    wins_out = rng.binomial(opps, opp_to_win)
+    
+    # Apply churn (depends on last month's customers, so step through months)
+    active_customers = np.zeros(n_sims, dtype=np.int64)
+    for m in range(months):
+        churned = rng.binomial(active_customers, churn_rate)
+        active_customers = np.maximum(0, active_customers - churned + wins_out[m])
+        active_out[m] = active_customers
+    
+    # Revenue and costs follow from the customer and win paths
+    revenue_out = active_out * (acv / 12)
+    cum_revenue_out = np.cumsum(revenue_out, axis=0) * gross_margin
+    cum_cost_out = np.cumsum(wins_out * cac, axis=0)
+    
+    net_revenue_out = cum_revenue_out - cum_cost_out
+    return active_out, revenue_out, cum_revenue_out, cum_cost_out, net_revenue_out
+
+
+# Metrics summarized per month, in summary column order
+SUMMARY_METRICS = [
+    "monthly_revenue", "cumulative_revenue", "cumulative_cost", "net_revenue", "active_customers"
+]
+
+
+def arrays_to_long(arrays: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Convert (months, n_sims) simulation arrays to a long-format DataFrame.
+    
+    Args:
+        arrays: Metric name -> (months, n_sims) array, as returned by
+            MonteCarloSimulator.simulate_revenue_arrays
+            
+    Returns:
+        DataFrame with one row per simulation-month
+    """
+    months, n_sims = next(iter(arrays.values())).shape
+    columns = {
+        "simulation": np.repeat(np.arange(n_sims), months),
+        "month": np.tile(np.arange(1, months + 1), n_sims)
+    }
+    for name, values in arrays.items():
+        columns[name] = values.T.ravel()
+    return pd.DataFrame(columns)
+
+
 class MonteCarloSimulator:
     """Monte Carlo simulation engine for revenue and payback uncertainty."""
     
@@ -35,6 +124,30 @@ class MonteCarloSimulator:
         Returns:
             Tuple of (simulation_results_df, summary_statistics_df)
         """
+        arrays, summary_stats = self.simulate_revenue_arrays(
+            months=months,
+            n_sims=n_sims,
+            market_adjustment=market_adjustment
+        )
+        return arrays_to_long(arrays), summary_stats
+    
+    def simulate_revenue_arrays(
+        self,
+        months: int = 12,
+        n_sims: int = 3000,
+        market_adjustment: float = 1.0
+    ) -> Tuple[Dict[str, np.ndarray], pd.DataFrame]:
+        """
+        Run Monte Carlo simulation without building the long-format results.
+        
+        Args:
+            months: Forecast horizon in months
+            n_sims: Number of simulation runs
+            market_adjustment: Market size adjustment factor
+            
+        Returns:
+            Tuple of (metric name -> (months, n_sims) array, summary_statistics_df)
+        """
         # Base assumptions
         funnel = self.assumptions.get("funnel", {})
         retention = self.assumptions.get("retention", {})
@@ -57,132 +170,103 @@ class MonteCarloSimulator:
         churn_sd = self.uncertainty.get("churn_sd", 0.006)
         cac_sd = self.uncertainty.get("cac_sd", 2500)
         
-        # Storage for results
-        all_results = []
-        
-        np.random.seed(42)  # Reproducibility
-        
-        for sim in range(n_sims):
-            # Sample from distributions
-            lead_to_opp = np.clip(
-                np.random.normal(base_lead_to_opp, lead_to_opp_sd),
-                0.05, 0.50
-            )
-            opp_to_win = np.clip(
-                np.random.normal(base_opp_to_win, opp_to_win_sd),
-                0.05, 0.50
-            )
-            churn_rate = np.clip(
-                np.random.normal(base_churn, churn_sd),
-                0.005, 0.05
-            )
-            cac = np.clip(
-                np.random.normal(base_cac, cac_sd),
-                8000, 25000
-            )
-            
-            # Run forecast for this simulation
-            active_customers = 0
-            total_revenue = 0
-            total_cost = 0
-            
-            monthly_results = []
-            
-            for month in range(1, months + 1):
-                # Generate leads (add some noise)
-                leads = int(np.random.poisson(base_leads))
-                
-                # Convert to opportunities (with lag)
-                if month >= sales_cycle:
-                    opps = int(leads * lead_to_opp)
-                else:
-                    opps = 0
-                
-                # Convert to wins
-                if month >= sales_cycle:
-                    wins = int(np.random.binomial(opps, opp_to_win))
-                else:
-                    wins = 0
-                
-                # Apply churn
-                churned = int(np.random.binomial(active_customers, churn_rate))
-                active_customers = max(0, active_customers - churned + wins)
-                
-                # Calculate revenue
-                monthly_revenue = active_customers * (acv / 12)
-                total_revenue += monthly_revenue
-                
-                # Calculate costs
-                acquisition_cost = wins * cac
-                total_cost += acquisition_cost
-                
-                monthly_results.append({
-                    "simulation": sim,
-                    "month": month,
-                    "active_customers": active_customers,
-                    "monthly_revenue": monthly_revenue,
-                    "cumulative_revenue": total_revenue * gross_margin,
-                    "cumulative_cost": total_cost,
-                    "net_revenue": (total_revenue * gross_margin) - total_cost
-                })
-            
-            all_results.extend(monthly_results)
+        # Local generator keeps runs reproducible without touching global state
+        rng = np.random.default_rng(self.simulation_config.get("seed", 42))
         
-        # Convert to DataFrame
-        results_df = pd.DataFrame(all_results)
+        # Sample per-simulation parameters from their distributions
+        lead_to_opp = np.clip(
+            rng.normal(base_lead_to_opp, lead_to_opp_sd, size=n_sims),
+            0.05, 0.50
+        )
+        opp_to_win = np.clip(
+            rng.normal(base_opp_to_win, opp_to_win_sd, size=n_sims),
+            0.05, 0.50
+        )
+        churn_rate = np.clip(
+            rng.normal(base_churn, churn_sd, size=n_sims),
+            0.005, 0.05
+        )
+        cac = np.clip(
+            rng.normal(base_cac, cac_sd, size=n_sims),
+            8000, 25000
+        )
         
-        # Calculate summary statistics by month
-        summary_cols = ["monthly_revenue", "cumulative_revenue", "cumulative_cost", "net_revenue", "active_customers"]
-        summary_stats = results_df.groupby("month")[summary_cols].agg([
-            "mean", "std", "median",
-            lambda x: np.percentile(x, 10),  # P10
-            lambda x: np.percentile(x, 90)   # P90
-        ]).round(2)
+        # Run the month-by-month forecast for every simulation
+        (
+            active_customers,
+            monthly_revenue,
+            cumulative_revenue,
+            cumulative_cost,
+            net_revenue
+        ) = _simulate_core(
+            base_leads, lead_to_opp, opp_to_win, churn_rate, cac,
+            acv, gross_margin, sales_cycle, months, rng
+        )
+        arrays = {
+            "active_customers": active_customers,
+            "monthly_revenue": monthly_revenue,
+            "cumulative_revenue": cumulative_revenue,
+            "cumulative_cost": cumulative_cost,
+            "net_revenue": net_revenue
+        }
         
-        # Flatten column names
-        summary_stats.columns = ["_".join(col).strip() for col in summary_stats.columns.values]
-        summary_stats = summary_stats.reset_index()
+        # Calculate summary statistics by month directly on the
+        # (months, n_sims) matrices; column names match the former
+        # groupby/agg output (P10/P90 kept as <lambda_0>/<lambda_1>)
+        summary = {"month": np.arange(1, months + 1)}
+        for name in SUMMARY_METRICS:
+            values = arrays[name]
+            p10, median, p90 = np.percentile(values, [10, 50, 90], axis=1)
+            summary[f"{name}_mean"] = values.mean(axis=1)
+            summary[f"{name}_std"] = values.std(axis=1, ddof=1)
+            summary[f"{name}_median"] = median
+            summary[f"{name}_<lambda_0>"] = p10
+            summary[f"{name}_<lambda_1>"] = p90
+        summary_stats = pd.DataFrame(summary).round(2)
         
-        return results_df, summary_stats
+        return arrays, summary_stats
     
     def calculate_payback_distribution(
         self,
-        simulation_results: pd.DataFrame,
+        simulation_results,
         entry_cost: float = 120000
-    ) -> pd.DataFrame:
+    ) -> Tuple[pd.DataFrame, Dict]:
         """
         Calculate payback period distribution across simulations.
         
         Args:
-            simulation_results: Full simulation results DataFrame
+            simulation_results: Full simulation results DataFrame, or the
+                (months, n_sims) net revenue matrix
             entry_cost: Market entry cost
             
         Returns:
-            DataFrame with payback statistics per simulation
+            Tuple of (payback_df per simulation, payback statistics dict)
         """
-        payback_periods = []
+        # Lay net revenue out as a (months, n_sims) matrix
+        if isinstance(simulation_results, np.ndarray):
+            net_revenue = simulation_results
+            month_labels = np.arange(1, net_revenue.shape[0] + 1)
+        else:
+            wide = simulation_results.pivot(
+                index="month", columns="simulation", values="net_revenue"
+            ).reindex(columns=simulation_results["simulation"].unique())
+            net_revenue = wide.to_numpy()
+            month_labels = wide.index.to_numpy()
         
-        for sim_id in simulation_results["simulation"].unique():
-            sim_data = simulation_results[simulation_results["simulation"] == sim_id].copy()
-            sim_data = sim_data.sort_values("month")
-            
-            # Find first month where net_revenue >= entry_cost
-            payback_mask = sim_data["net_revenue"] >= entry_cost
-            if payback_mask.any():
-                payback_month = sim_data[payback_mask]["month"].iloc[0]
-                payback_periods.append(payback_month)
-            else:
-                payback_periods.append(-1)  # Never pays back
+        # First month where net_revenue >= entry_cost, -1 if it never pays back
+        crossed = net_revenue >= entry_cost
+        first_idx = crossed.argmax(axis=0)
+        payback_periods = np.where(crossed.any(axis=0), month_labels[first_idx], -1)
         
         payback_df = pd.DataFrame({
-            "simulation": range(len(payback_periods)),
+            "simulation": np.arange(len(payback_periods)),
             "payback_period_months": payback_periods
         })
         
         # Calculate statistics
-        valid_paybacks = [p for p in payback_periods if p > 0]
+        valid_paybacks = payback_periods[payback_periods > 0]
         
-        if valid_paybacks:
+        if len(valid_paybacks) > 0:
             stats_dict = {
                 "mean": np.mean(valid_paybacks),
                 "median": np.median(valid_paybacks),
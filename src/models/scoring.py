@@ -1,10 +1,105 @@
 """Multi-criteria decision analysis (MCDA) scoring and sensitivity analysis."""
-from typing import Dict, List, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
 
+# Map weight names to standardized feature columns
+FEATURE_MAPPING: Dict[str, str] = {
+    "market_size": "market_size_score_standardized",
+    "purchasing_power": "purchasing_power_score_standardized",
+    "digital_readiness": "digital_readiness_score_standardized",
+    "governance_risk": "governance_risk_score_standardized",
+    "corruption_risk": "corruption_risk_score_standardized",
+}
+
+
+def _rank_descending(scores: np.ndarray) -> np.ndarray:
+    """
+    Rank scores along the last axis (1 = highest), giving ties the minimum rank.
+    
+    Args:
+        scores: Array of scores, ranked independently per row if 2D
+        
+    Returns:
+        Integer array of ranks with the same shape as scores
+    """
+    order = np.argsort(-scores, axis=-1, kind="stable")
+    sorted_scores = np.take_along_axis(scores, order, axis=-1)
+    
+    # Position of the first member of each run of tied scores
+    positions = np.broadcast_to(np.arange(1, scores.shape[-1] + 1), scores.shape)
+    is_first = np.ones(scores.shape, dtype=bool)
+    is_first[..., 1:] = sorted_scores[..., 1:] != sorted_scores[..., :-1]
+    sorted_ranks = np.maximum.accumulate(np.where(is_first, positions, 0), axis=-1)
+    
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, sorted_ranks, axis=-1)
+    return ranks
+
+
+def _sweep_weights(
+    base_w: np.ndarray,
+    idx: int,
+    sweep_vals: np.ndarray,
+    other_weights_sum: float
+) -> np.ndarray:
+    """
+    Build the weight vectors for a single-weight sweep.
+    
+    The swept weight takes each value in sweep_vals while the other weights
+    are rescaled proportionally so the total stays at 1.0.
+    
+    Args:
+        base_w: Base weight vector
+        idx: Index of the weight being varied
+        sweep_vals: Values to test for the varied weight
+        other_weights_sum: Sum of the base weights other than idx
+        
+    Returns:
+        (n_runs, n_weights) matrix with one weight vector per row
+    """
+    W = np.tile(base_w, (len(sweep_vals), 1))
+    if other_weights_sum > 0:
+        W *= ((1.0 - sweep_vals) / other_weights_sum)[:, None]
+    W[:, idx] = sweep_vals
+    return W
+
+
+def _top_markets_frame(
+    weight_name: str,
+    weight_values: np.ndarray,
+    scores: np.ndarray,
+    ranks: np.ndarray,
+    country_codes: np.ndarray
+) -> pd.DataFrame:
+    """
+    Collect the top 3 markets of every sweep run into one DataFrame.
+    
+    Args:
+        weight_name: Name of the swept weight
+        weight_values: Tested values of the swept weight
+        scores: (n_runs, n_markets) total scores
+        ranks: (n_runs, n_markets) ranks
+        country_codes: Country code of each market column
+        
+    Returns:
+        DataFrame with sensitivity results (rows in rank order per run)
+    """
+    top_idx = np.argsort(ranks, axis=1, kind="stable")[:, :3]
+    n_top = top_idx.shape[1]
+    
+    return pd.DataFrame({
+        "weight_name": weight_name,
+        "weight_value": np.repeat(weight_values, n_top),
+        "country_code": country_codes[top_idx].ravel(),
+        "rank": np.take_along_axis(ranks, top_idx, axis=1).ravel(),
+        "total_score": np.take_along_axis(scores, top_idx, axis=1).ravel()
+    })
+
+
 class MarketScorer:
     """MCDA scoring engine for market ranking."""
     
@@ -15,8 +110,15 @@ class MarketScorer:
         Args:
             weights: Dictionary of feature_name -> weight (should sum to 1.0)
         """
-        self.weights = weights
+        # Read-only snapshot, so the arrays derived below cannot go stale
+        self.weights = MappingProxyType(dict(weights))
         self._validate_weights()
+        
+        # Weight order, mapped feature columns and weight vector, resolved once
+        self._weight_names = list(self.weights)
+        self._idx = {k: i for i, k in enumerate(self._weight_names)}
+        self._feature_cols = [FEATURE_MAPPING.get(k) for k in self._weight_names]
+        self._w = np.fromiter(self.weights.values(), dtype=np.float64, count=len(self.weights))
     
     def _validate_weights(self) -> None:
         """Validate that weights sum to approximately 1.0."""
@@ -24,46 +126,66 @@ class MarketScorer:
         if abs(total - 1.0) > 0.01:
             print(f"Warning: Weights sum to {total:.3f}, not 1.0")
     
-    def score_markets(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _feature_matrix(self, df: pd.DataFrame) -> np.ndarray:
+        """Standardized features in weight order; missing columns contribute zero."""
+        X = np.zeros((len(df), len(self._weight_names)), dtype=np.float64)
+        for i, feature_col in enumerate(self._feature_cols):
+            if feature_col and feature_col in df.columns:
+                X[:, i] = df[feature_col].to_numpy(dtype=np.float64)
+        return X
+    
+    def score_markets(
+        self,
+        df: pd.DataFrame,
+        features: Optional[np.ndarray] = None,
+        include_components: bool = True
+    ) -> pd.DataFrame:
         """
         Score markets using weighted sum of standardized features.
         
         Args:
             df: DataFrame with standardized features
+            features: Optional precomputed (n_markets, n_weights) feature matrix
+                with rows aligned to df and columns in weight order; extracted
+                from df when omitted
+            include_components: Whether to add the per-weight score_<name>
+                columns; callers that only need total_score and rank can skip them
             
         Returns:
             DataFrame with scores and rankings
         """
-        df = df.copy()
-        
-        # Map feature names to standardized columns
-        feature_mapping = {
-            "market_size": "market_size_score_standardized",
-            "purchasing_power": "purchasing_power_score_standardized",
-            "digital_readiness": "digital_readiness_score_standardized",
-            "governance_risk": "governance_risk_score_standardized",
-            "corruption_risk": "corruption_risk_score_standardized",
-        }
-        
-        # Calculate weighted score
-        df["total_score"] = 0.0
-        
-        for weight_name, weight_value in self.weights.items():
-            feature_col = feature_mapping.get(weight_name)
-            if feature_col and feature_col in df.columns:
-                df["total_score"] += weight_value * df[feature_col]
-            else:
-                print(f"Warning: Feature column {feature_col} not found for weight {weight_name}")
+        if features is not None:
+            weight_names = self._weight_names
+            w = self._w.astype(features.dtype, copy=False)
+            X = features
+        else:
+            # Keep only the weights whose standardized column is present
+            present = []
+            for i, (weight_name, feature_col) in enumerate(zip(self._weight_names, self._feature_cols)):
+                if feature_col and feature_col in df.columns:
+                    present.append(i)
+                else:
+                    print(f"Warning: Feature column {feature_col} not found for weight {weight_name}")
+            weight_names = [self._weight_names[i] for i in present]
+            w = self._w[present]
+            X = df[[self._feature_cols[i] for i in present]].to_numpy(dtype=np.float64)
         
-        # Add component scores for visualization
-        for weight_name, weight_value in self.weights.items():
-            feature_col = feature_mapping.get(weight_name)
-            if feature_col and feature_col in df.columns:
-                df[f"score_{weight_name}"] = weight_value * df[feature_col]
+        # Calculate weighted score as a single matrix-vector product
+        total_score = X @ w
+        
+        # Rank markets (ties share the best rank, as with method="min")
+        ranks = _rank_descending(total_score)
+        order = np.argsort(ranks, kind="stable")
         
-        # Rank markets
-        df["rank"] = df["total_score"].rank(ascending=False, method="min").astype(int)
-        df = df.sort_values("rank")
+        # Reorder the input rows once by rank and attach total, component
+        # (for visualization) and rank columns; df itself is left untouched
+        score_cols = {"total_score": total_score[order]}
+        if include_components:
+            components = X[order] * w
+            for i, weight_name in enumerate(weight_names):
+                score_cols[f"score_{weight_name}"] = components[:, i]
+        score_cols["rank"] = ranks[order]
+        df = df.take(order).assign(**score_cols)
         
         return df
     
@@ -86,46 +208,47 @@ class MarketScorer:
         Returns:
             DataFrame with sensitivity results
         """
-        if weight_name not in self.weights:
+        if weight_name not in self._idx:
             raise ValueError(f"Weight {weight_name} not found")
         
-        results = []
-        original_weight = self.weights[weight_name]
-        other_weights_sum = sum(v for k, v in self.weights.items() if k != weight_name)
+        # Score all weight variations at once
+        weight_values, W = self._sweep(weight_name, step, n_runs)
+        scores = W @ self._feature_matrix(df).T
+        ranks = _rank_descending(scores)
+        
+        # Record rank changes for top 3 markets
+        return _top_markets_frame(
+            weight_name, weight_values, scores, ranks, df["country_code"].to_numpy()
+        )
+    
+    def _sweep(
+        self,
+        weight_name: str,
+        step: float,
+        n_runs: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate the tested values and weight vectors for one weight's sweep.
+        
+        Args:
+            weight_name: Name of weight to vary
+            step: Step size for weight variation
+            n_runs: Number of simulation runs
+            
+        Returns:
+            Tuple of (weight_values, (n_runs, n_weights) weight matrix)
+        """
+        idx = self._idx[weight_name]
+        original_weight = self._w[idx]
+        other_weights_sum = np.delete(self._w, idx).sum()
         
         # Generate weight variations
         min_weight = max(0.0, original_weight - (step * n_runs // 2))
         max_weight = min(1.0, original_weight + (step * n_runs // 2))
         weight_values = np.linspace(min_weight, max_weight, n_runs)
         
-        for test_weight in weight_values:
-            # Normalize other weights proportionally
-            test_weights = self.weights.copy()
-            test_weights[weight_name] = test_weight
-            
-            remaining = 1.0 - test_weight
-            if other_weights_sum > 0:
-                scale = remaining / other_weights_sum
-                for k in test_weights:
-                    if k != weight_name:
-                        test_weights[k] *= scale
-            
-            # Score with test weights
-            scorer = MarketScorer(test_weights)
-            scored = scorer.score_markets(df)
-            
-            # Record rank changes for top 3 markets
-            top_markets = scored.head(3)[["country_code", "rank"]].copy()
-            for _, row in top_markets.iterrows():
-                results.append({
-                    "weight_name": weight_name,
-                    "weight_value": test_weight,
-                    "country_code": row["country_code"],
-                    "rank": row["rank"],
-                    "total_score": scored[scored["country_code"] == row["country_code"]]["total_score"].iloc[0]
-                })
-        
-        return pd.DataFrame(results)
+        W = _sweep_weights(self._w, idx, weight_values, other_weights_sum)
+        return weight_values, W
 
 
 def run_full_sensitivity(
@@ -149,9 +272,19 @@ def run_full_sensitivity(
     scorer = MarketScorer(weights)
     results = {}
     
-    for weight_name in weights.keys():
-        sens_df = scorer.sensitivity_analysis(df, weight_name, step, n_runs)
-        results[weight_name] = sens_df
+    # Stack every weight's sweep and score them all in one matrix product
+    sweeps = [scorer._sweep(weight_name, step, n_runs) for weight_name in weights]
+    if not sweeps:
+        return results
+    scores = np.vstack([W for _, W in sweeps]) @ scorer._feature_matrix(df).T
+    ranks = _rank_descending(scores)
+    
+    country_codes = df["country_code"].to_numpy()
+    for i, (weight_name, (weight_values, _)) in enumerate(zip(weights, sweeps)):
+        rows = slice(i * n_runs, (i + 1) * n_runs)
+        results[weight_name] = _top_markets_frame(
+            weight_name, weight_values, scores[rows], ranks[rows], country_codes
+        )
     
     return results
 
@@ -1,6 +1,8 @@
 """Generate PowerPoint presentation with expansion recommendations."""
+import io
 from typing import Dict, List
 from pathlib import Path
+import pptx
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
@@ -9,6 +11,10 @@ import pandas as pd
 import numpy as np
 
 
+# python-pptx's default template, read once so each deck opens it from memory
+_TEMPLATE_BYTES = (Path(pptx.__file__).parent / "templates" / "default.pptx").read_bytes()
+
+
 def create_presentation(
     market_scores: pd.DataFrame,
     sensitivity_results: Dict,
@@ -28,40 +34,43 @@ def create_presentation(
         assumptions: Business assumptions
         output_path: Output file path
     """
-    prs = Presentation()
+    prs = Presentation(io.BytesIO(_TEMPLATE_BYTES))
     prs.slide_width = Inches(10)
     prs.slide_height = Inches(7.5)
     
+    # Every slide uses the blank layout; resolve it once
+    blank_layout = prs.slide_layouts[6]
+    
     # Slide 1: Title
-    slide = prs.slides.add_slide(prs.slide_layouts[6])  # Blank layout
+    slide = prs.slides.add_slide(blank_layout)
     add_title_slide(slide, "APAC Expansion Decision Engine", "Market Prioritization & Revenue Forecasting")
     
     # Slide 2: Objective
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = prs.slides.add_slide(blank_layout)
     add_objective_slide(slide, assumptions)
     
     # Slide 3: Data Sources
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = prs.slides.add_slide(blank_layout)
     add_data_sources_slide(slide)
     
     # Slide 4: Market Ranking
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = prs.slides.add_slide(blank_layout)
     add_ranking_slide(slide, market_scores)
     
     # Slide 5: Sensitivity Analysis
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = prs.slides.add_slide(blank_layout)
     add_sensitivity_slide(slide, sensitivity_results)
     
     # Slide 6: Recommended Sequencing
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = prs.slides.add_slide(blank_layout)
     add_sequencing_slide(slide, market_scores)
     
     # Slide 7: 12-Month Plan
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = prs.slides.add_slide(blank_layout)
     add_plan_slide(slide, market_scores, assumptions, forecast_scenarios)
     
     # Slide 8: Risks & Mitigations
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = prs.slides.add_slide(blank_layout)
     add_risks_slide(slide, monte_carlo_stats)
     
     # Save
@@ -71,52 +80,76 @@ def create_presentation(
     print(f"Presentation saved to {output_path}")
 
 
+def add_styled_text(
+    slide,
+    left,
+    top,
+    width,
+    height,
+    text: str,
+    size: int,
+    bold: bool = False,
+    align=None,
+    word_wrap: bool = False,
+    style_all: bool = False
+) -> None:
+    """
+    Add a textbox and style its text in one step.
+    
+    Args:
+        slide: Slide to add the textbox to
+        left, top, width, height: Textbox position and size
+        text: Text content (newlines start new paragraphs)
+        size: Font size in points
+        bold: Make the styled paragraphs bold
+        align: Optional paragraph alignment (PP_ALIGN member)
+        word_wrap: Wrap text at the textbox width
+        style_all: Style every paragraph instead of only the first
+    """
+    tf = slide.shapes.add_textbox(left, top, width, height).text_frame
+    if word_wrap:
+        tf.word_wrap = True
+    tf.text = text
+    
+    paragraphs = tf.paragraphs if style_all else tf.paragraphs[:1]
+    for para in paragraphs:
+        para.font.size = Pt(size)
+        if bold:
+            para.font.bold = True
+        if align is not None:
+            para.alignment = align
+
+
+def add_slide_title(slide, title: str) -> None:
+    """Add the standard slide heading."""
+    add_styled_text(slide, Inches(0.5), Inches(0.5), Inches(9), Inches(0.8), title, 32, bold=True)
+
+
+def add_slide_body(slide, text: str, size: int) -> None:
+    """Add the standard word-wrapped body text below the heading."""
+    add_styled_text(
+        slide, Inches(0.5), Inches(1.5), Inches(9), Inches(5),
+        text, size, word_wrap=True, style_all=True
+    )
+
+
 def add_title_slide(slide, title: str, subtitle: str) -> None:
     """Add title slide."""
-    # Title
-    left = Inches(1)
-    top = Inches(2)
-    width = Inches(8)
-    height = Inches(1.5)
-    
-    txBox = slide.shapes.add_textbox(left, top, width, height)
-    tf = txBox.text_frame
-    tf.text = title
-    tf.paragraphs[0].font.size = Pt(44)
-    tf.paragraphs[0].font.bold = True
-    tf.paragraphs[0].alignment = PP_ALIGN.CENTER
-    
-    # Subtitle
-    top = Inches(4)
-    height = Inches(1)
-    txBox2 = slide.shapes.add_textbox(left, top, width, height)
-    tf2 = txBox2.text_frame
-    tf2.text = subtitle
-    tf2.paragraphs[0].font.size = Pt(24)
-    tf2.paragraphs[0].alignment = PP_ALIGN.CENTER
+    add_styled_text(
+        slide, Inches(1), Inches(2), Inches(8), Inches(1.5),
+        title, 44, bold=True, align=PP_ALIGN.CENTER
+    )
+    add_styled_text(
+        slide, Inches(1), Inches(4), Inches(8), Inches(1),
+        subtitle, 24, align=PP_ALIGN.CENTER
+    )
 
 
 def add_objective_slide(slide, assumptions: Dict) -> None:
     """Add objective slide."""
-    # Title
-    left = Inches(0.5)
-    top = Inches(0.5)
-    width = Inches(9)
-    height = Inches(0.8)
-    
-    txBox = slide.shapes.add_textbox(left, top, width, height)
-    tf = txBox.text_frame
-    tf.text = "Objective"
-    tf.paragraphs[0].font.size = Pt(32)
-    tf.paragraphs[0].font.bold = True
+    add_slide_title(slide, "Objective")
     
     # Content
-    top = Inches(1.5)
-    height = Inches(5)
-    txBox2 = slide.shapes.add_textbox(left, top, width, height)
-    tf2 = txBox2.text_frame
-    tf2.word_wrap = True
-    
     product = assumptions.get("business", {}).get("product", "B2B SaaS platform")
     
     text = f"""
@@ -129,32 +162,14 @@ def add_objective_slide(slide, assumptions: Dict) -> None:
     
     Goal: Data-driven expansion strategy with 12-month execution plan
     """
-    tf2.text = text
-    for para in tf2.paragraphs:
-        para.font.size = Pt(18)
+    add_slide_body(slide, text, 18)
 
 
 def add_data_sources_slide(slide) -> None:
     """Add data sources slide."""
-    # Title
-    left = Inches(0.5)
-    top = Inches(0.5)
-    width = Inches(9)
-    height = Inches(0.8)
-    
-    txBox = slide.shapes.add_textbox(left, top, width, height)
-    tf = txBox.text_frame
-    tf.text = "Data Sources"
-    tf.paragraphs[0].font.size = Pt(32)
-    tf.paragraphs[0].font.bold = True
+    add_slide_title(slide, "Data Sources")
     
     # Content
-    top = Inches(1.5)
-    height = Inches(5)
-    txBox2 = slide.shapes.add_textbox(left, top, width, height)
-    tf2 = txBox2.text_frame
-    tf2.word_wrap = True
-    
     text = """
     World Bank API V2:
     • Population (SP.POP.TOTL)
@@ -168,24 +183,12 @@ def add_data_sources_slide(slide) -> None:
     Our World in Data:
     • Corruption Perceptions Index (CPI)
     """
-    tf2.text = text
-    for para in tf2.paragraphs:
-        para.font.size = Pt(16)
+    add_slide_body(slide, text, 16)
 
 
 def add_ranking_slide(slide, market_scores: pd.DataFrame) -> None:
     """Add market ranking slide."""
-    # Title
-    left = Inches(0.5)
-    top = Inches(0.5)
-    width = Inches(9)
-    height = Inches(0.8)
-    
-    txBox = slide.shapes.add_textbox(left, top, width, height)
-    tf = txBox.text_frame
-    tf.text = "Market Ranking Results"
-    tf.paragraphs[0].font.size = Pt(32)
-    tf.paragraphs[0].font.bold = True
+    add_slide_title(slide, "Market Ranking Results")
     
     # Table
     top = Inches(1.5)
@@ -205,11 +208,14 @@ def add_ranking_slide(slide, market_scores: pd.DataFrame) -> None:
     table.cell(0, 1).text = "Country"
     table.cell(0, 2).text = "Score"
     
-    # Data
-    for i, (_, row) in enumerate(top_markets.iterrows(), 1):
-        table.cell(i, 0).text = str(int(row["rank"]))
-        table.cell(i, 1).text = row["country_code"]
-        table.cell(i, 2).text = f"{row['total_score']:.3f}"
+    # Data (columns pulled out once as plain Python lists)
+    ranks = top_markets["rank"].to_numpy().astype(int).tolist()
+    codes = top_markets["country_code"].tolist()
+    scores = top_markets["total_score"].to_numpy().tolist()
+    for i, (rank, code, score) in enumerate(zip(ranks, codes, scores), 1):
+        table.cell(i, 0).text = str(rank)
+        table.cell(i, 1).text = code
+        table.cell(i, 2).text = f"{score:.3f}"
     
     # Format headers
     for col in range(cols):
@@ -224,25 +230,9 @@ def add_ranking_slide(slide, market_scores: pd.DataFrame) -> None:
 
 def add_sensitivity_slide(slide, sensitivity_results: Dict) -> None:
     """Add sensitivity analysis slide."""
-    # Title
-    left = Inches(0.5)
-    top = Inches(0.5)
-    width = Inches(9)
-    height = Inches(0.8)
-    
-    txBox = slide.shapes.add_textbox(left, top, width, height)
-    tf = txBox.text_frame
-    tf.text = "Sensitivity Analysis"
-    tf.paragraphs[0].font.size = Pt(32)
-    tf.paragraphs[0].font.bold = True
+    add_slide_title(slide, "Sensitivity Analysis")
     
     # Summary
-    top = Inches(1.5)
-    height = Inches(5)
-    txBox2 = slide.shapes.add_textbox(left, top, width, height)
-    tf2 = txBox2.text_frame
-    tf2.word_wrap = True
-    
     text = "Key Findings:\n\n"
     for weight_name in list(sensitivity_results.keys())[:3]:
         text += f"• {weight_name}: Rankings are "
@@ -251,73 +241,37 @@ def add_sensitivity_slide(slide, sensitivity_results: Dict) -> None:
     
     text += "\nRecommendation: Top 3 markets (Australia, Singapore, Japan) remain stable across weight variations."
     
-    tf2.text = text
-    for para in tf2.paragraphs:
-        para.font.size = Pt(16)
+    add_slide_body(slide, text, 16)
 
 
 def add_sequencing_slide(slide, market_scores: pd.DataFrame) -> None:
     """Add recommended sequencing slide."""
-    # Title
-    left = Inches(0.5)
-    top = Inches(0.5)
-    width = Inches(9)
-    height = Inches(0.8)
-    
-    txBox = slide.shapes.add_textbox(left, top, width, height)
-    tf = txBox.text_frame
-    tf.text = "Recommended Market Sequencing"
-    tf.paragraphs[0].font.size = Pt(32)
-    tf.paragraphs[0].font.bold = True
+    add_slide_title(slide, "Recommended Market Sequencing")
     
     # Phase 1
-    top = Inches(1.5)
-    left_col = Inches(0.5)
-    width_col = Inches(4)
-    height_col = Inches(2)
-    
-    txBox1 = slide.shapes.add_textbox(left_col, top, width_col, height_col)
-    tf1 = txBox1.text_frame
-    tf1.text = "Phase 1 (Months 1-4):\n• Australia\n• Singapore\n• Japan"
-    tf1.paragraphs[0].font.size = Pt(18)
-    tf1.paragraphs[0].font.bold = True
+    add_styled_text(
+        slide, Inches(0.5), Inches(1.5), Inches(4), Inches(2),
+        "Phase 1 (Months 1-4):\n• Australia\n• Singapore\n• Japan", 18, bold=True
+    )
     
     # Phase 2
-    left_col2 = Inches(5.5)
-    txBox2 = slide.shapes.add_textbox(left_col2, top, width_col, height_col)
-    tf2 = txBox2.text_frame
-    tf2.text = "Phase 2 (Months 5-8):\n• South Korea\n• New Zealand\n• Malaysia"
-    tf2.paragraphs[0].font.size = Pt(18)
+    add_styled_text(
+        slide, Inches(5.5), Inches(1.5), Inches(4), Inches(2),
+        "Phase 2 (Months 5-8):\n• South Korea\n• New Zealand\n• Malaysia", 18
+    )
     
     # Phase 3
-    top2 = Inches(3.5)
-    txBox3 = slide.shapes.add_textbox(left_col, top2, width_col, height_col)
-    tf3 = txBox3.text_frame
-    tf3.text = "Phase 3 (Months 9-12):\n• Thailand\n• Vietnam\n• Indonesia\n• India"
-    tf3.paragraphs[0].font.size = Pt(18)
+    add_styled_text(
+        slide, Inches(0.5), Inches(3.5), Inches(4), Inches(2),
+        "Phase 3 (Months 9-12):\n• Thailand\n• Vietnam\n• Indonesia\n• India", 18
+    )
 
 
 def add_plan_slide(slide, market_scores: pd.DataFrame, assumptions: Dict, forecast_scenarios: Dict) -> None:
     """Add 12-month plan slide."""
-    # Title
-    left = Inches(0.5)
-    top = Inches(0.5)
-    width = Inches(9)
-    height = Inches(0.8)
-    
-    txBox = slide.shapes.add_textbox(left, top, width, height)
-    tf = txBox.text_frame
-    tf.text = "12-Month Hiring & Budget Plan"
-    tf.paragraphs[0].font.size = Pt(32)
-    tf.paragraphs[0].font.bold = True
+    add_slide_title(slide, "12-Month Hiring & Budget Plan")
     
     # Content
-    top = Inches(1.5)
-    height = Inches(5)
-    txBox2 = slide.shapes.add_textbox(left, top, width, height)
-    tf2 = txBox2.text_frame
-    tf2.word_wrap = True
-    
     entry_cost = assumptions.get("costs", {}).get("market_entry_cost_usd", 120000)
     
     text = f"""
@@ -333,32 +287,14 @@ def add_plan_slide(slide, market_scores: pd.DataFrame, assumptions: Dict, foreca
     
     Total Year 1 Investment: ~$2.4M across 10 markets
     """
-    tf2.text = text
-    for para in tf2.paragraphs:
-        para.font.size = Pt(16)
+    add_slide_body(slide, text, 16)
 
 
 def add_risks_slide(slide, monte_carlo_stats: Dict) -> None:
     """Add risks and mitigations slide."""
-    # Title
-    left = Inches(0.5)
-    top = Inches(0.5)
-    width = Inches(9)
-    height = Inches(0.8)
-    
-    txBox = slide.shapes.add_textbox(left, top, width, height)
-    tf = txBox.text_frame
-    tf.text = "Risks & Mitigations"
-    tf.paragraphs[0].font.size = Pt(32)
-    tf.paragraphs[0].font.bold = True
+    add_slide_title(slide, "Risks & Mitigations")
     
     # Content
-    top = Inches(1.5)
-    height = Inches(5)
-    txBox2 = slide.shapes.add_textbox(left, top, width, height)
-    tf2 = txBox2.text_frame
-    tf2.word_wrap = True
-    
     text = """
     Key Risks:
     • Revenue uncertainty (Monte Carlo shows 10-90% range)
@@ -371,7 +307,5 @@ def add_risks_slide(slide, monte_carlo_stats: Dict) -> None:
     • Build local partnerships to reduce entry costs
     • Continuous monitoring of governance indicators
     """
-    tf2.text = text
-    for para in tf2.paragraphs:
-        para.font.size = Pt(16)
+    add_slide_body(slide, text, 16)
 
@@ -0,0 +1,158 @@
+"""Tests for data source clients (HTTP stubbed, no network)."""
+import pytest
+import pandas as pd
+from src.data_sources.owid import OWIDClient
+from src.data_sources.wgi import WGIClient
+from src.data_sources.worldbank import WorldBankClient
+
+
+class StubResponse:
+    """Minimal stand-in for requests.Response."""
+    
+    def __init__(self, status_code=200, content=b"", headers=None, json_data=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self._json_data = json_data
+    
+    def json(self):
+        return self._json_data
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class StubSession:
+    """Session returning queued responses (or responder(url)) and recording each request."""
+    
+    def __init__(self, responses):
+        self.responder = responses if callable(responses) else None
+        self.responses = [] if callable(responses) else list(responses)
+        self.calls = []
+    
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append({"url": url, "params": params, "headers": headers or {}})
+        if self.responder is not None:
+            return self.responder(url)
+        return self.responses.pop(0)
+
+
+CPI_CSV_V1 = b"Entity,Code,Year,Corruption Perceptions Index\nAustralia,AUS,2022,75\nSingapore,SGP,2022,83\n"
+CPI_CSV_V2 = b"Entity,Code,Year,Corruption Perceptions Index\nAustralia,AUS,2023,77\nSingapore,SGP,2023,84\n"
+
+
+def test_owid_cache_revalidated_with_conditional_get(tmp_path):
+    """Test a cached CPI table is kept on 304 and replaced on 200."""
+    # Cold run: full download, validators recorded next to the cache
+    client = OWIDClient(cache_dir=str(tmp_path))
+    client.session = StubSession([StubResponse(200, CPI_CSV_V1, {"ETag": '"v1"'})])
+    first = client.fetch_cpi(country_codes=["AUS", "SGP"])
+    assert first["cpi_score"].tolist() == [75, 83]
+    
+    # Warm run, unchanged upstream: conditional GET, cached table reused
+    client = OWIDClient(cache_dir=str(tmp_path))
+    client.session = StubSession([StubResponse(304)])
+    second = client.fetch_cpi(country_codes=["AUS", "SGP"])
+    assert client.session.calls[0]["headers"]["If-None-Match"] == '"v1"'
+    pd.testing.assert_frame_equal(second, first)
+    
+    # Warm run, upstream changed: new body parsed and cached
+    client = OWIDClient(cache_dir=str(tmp_path))
+    client.session = StubSession([StubResponse(200, CPI_CSV_V2, {"ETag": '"v2"'})])
+    third = client.fetch_cpi(country_codes=["AUS", "SGP"])
+    assert third["cpi_score"].tolist() == [77, 84]
+    
+    # Offline: revalidation fails, the (updated) cache is still returned
+    client = OWIDClient(cache_dir=str(tmp_path))
+    client.session = StubSession([StubResponse(503)])
+    offline = client.fetch_cpi(country_codes=["AUS", "SGP"])
+    assert client.session.calls[0]["headers"]["If-None-Match"] == '"v2"'
+    pd.testing.assert_frame_equal(offline, third)
+
+
+def test_worldbank_batched_fetch_keeps_latest_year_per_country(tmp_path):
+    """Test one ';'-joined request per indicator yields each country's latest value."""
+    def respond(url):
+        indicator_code = url.rsplit("/", 1)[-1]
+        records = [
+            {"countryiso3code": "AUS", "date": "2021", "value": 1.0},
+            {"countryiso3code": "AUS", "date": "2022", "value": 2.0},
+            {"countryiso3code": "SGP", "date": "2022", "value": None},
+            {"countryiso3code": "SGP", "date": "2020", "value": 3.0},
+            {"countryiso3code": "SGP", "date": "2021", "value": 4.0},
+        ]
+        if indicator_code == "IT.NET.USER.ZS":
+            records = records[:2]  # No SGP data at all
+        return StubResponse(json_data=[{"page": 1}, records])
+    
+    client = WorldBankClient(cache_dir=str(tmp_path))
+    client.session = StubSession(respond)
+    df = client.fetch_all_indicators(["AUS", "SGP"], year=2022)
+    
+    assert len(client.session.calls) == len(WorldBankClient.INDICATORS)
+    assert all("/AUS;SGP/indicator/" in call["url"] for call in client.session.calls)
+    
+    values = df.set_index(["country_code", "indicator"])["value"]
+    assert values[("AUS", "population")] == 2.0
+    assert values[("SGP", "population")] == 4.0  # Latest non-null year
+    assert values[("AUS", "internet_users_pct")] == 2.0
+    assert pd.isna(values[("SGP", "internet_users_pct")])
+    
+    # Cached values are reused; only the missing cell is requested again
+    client = WorldBankClient(cache_dir=str(tmp_path))
+    client.session = StubSession(respond)
+    again = client.fetch_all_indicators(["AUS", "SGP"], year=2022)
+    assert [call["url"].split("/")[-3] for call in client.session.calls] == ["SGP"]
+    pd.testing.assert_frame_equal(again, df)
+
+
+def test_worldbank_rejected_batch_retries_each_country(tmp_path):
+    """Test an invalid code in a batch only loses that country's values."""
+    def respond(url):
+        countries = url.split("/")[-3]
+        if "XXX" in countries.split(";"):
+            return StubResponse(json_data=[{"message": [{"id": "120", "key": "Invalid value"}]}])
+        return StubResponse(json_data=[{"page": 1}, [
+            {"countryiso3code": code, "date": "2022", "value": 5.0}
+            for code in countries.split(";")
+        ]])
+    
+    client = WorldBankClient(cache_dir=str(tmp_path))
+    client.session = StubSession(respond)
+    values = client._fetch_indicator_batch(["AUS", "XXX", "SGP"], "SP.POP.TOTL")
+    
+    assert values == {"AUS": 5.0, "XXX": None, "SGP": 5.0}
+    assert [call["url"].split("/")[-3] for call in client.session.calls] == ["AUS;XXX;SGP", "AUS", "XXX", "SGP"]
+
+
+def test_wgi_legacy_csv_cache_migrates_to_parquet(tmp_path):
+    """Test per-cell legacy CSVs are folded into one Parquet table."""
+    pd.DataFrame({"country_code": ["AUS"], "value": [1.6]}).to_csv(tmp_path / "wgi_AUS_RL.EST.csv", index=False)
+    pd.DataFrame({"country_code": ["AUS"], "value": [1.9]}).to_csv(tmp_path / "wgi_AUS_RQ.EST.csv", index=False)
+    
+    client = WGIClient(cache_dir=str(tmp_path))
+    client.session = StubSession([])  # Any request would fail the test
+    df = client.fetch_all_indicators(["AUS"])
+    
+    assert df["value"].tolist() == [1.6, 1.9]
+    assert client.session.calls == []
+    
+    cache_df = pd.read_parquet(tmp_path / "wgi_cache.parquet")
+    assert sorted(zip(cache_df["indicator_code"], cache_df["value"])) == [("RL.EST", 1.6), ("RQ.EST", 1.9)]
+    
+    # A new client reads the table, not the legacy files
+    (tmp_path / "wgi_AUS_RL.EST.csv").unlink()
+    (tmp_path / "wgi_AUS_RQ.EST.csv").unlink()
+    client = WGIClient(cache_dir=str(tmp_path))
+    client.session = StubSession([])
+    pd.testing.assert_frame_equal(client.fetch_all_indicators(["AUS"]), df)
+    
+    # Repeat calls on the same instance are served from the result memo
+    memo = client.fetch_all_indicators(["AUS"])
+    memo.loc[0, "value"] = 0.0
+    assert client.fetch_all_indicators(["AUS"])["value"].tolist() == [1.6, 1.9]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
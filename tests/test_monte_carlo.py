@@ -0,0 +1,84 @@
+"""Tests for Monte Carlo simulation."""
+import pytest
+import pandas as pd
+import numpy as np
+from src.models.monte_carlo import MonteCarloSimulator, SUMMARY_METRICS
+
+
+ASSUMPTIONS = {
+    "funnel": {
+        "leads_per_month_initial": 100,
+        "lead_to_opportunity": 0.2,
+        "opportunity_to_win": 0.25,
+        "sales_cycle_months": 3
+    },
+    "retention": {
+        "monthly_churn": 0.02
+    },
+    "commercial_assumptions": {
+        "acv_usd": 20000,
+        "gross_margin": 0.8
+    },
+    "costs": {
+        "cac_usd_per_customer": 15000
+    },
+    "simulation": {
+        "seed": 7
+    }
+}
+
+
+def test_simulation_arrays_shape_and_invariants():
+    """Test simulated paths are seeded, well-shaped and internally consistent."""
+    simulator = MonteCarloSimulator(ASSUMPTIONS)
+    arrays, summary = simulator.simulate_revenue_arrays(months=12, n_sims=200)
+    repeat, _ = simulator.simulate_revenue_arrays(months=12, n_sims=200)
+    
+    assert set(arrays) == set(SUMMARY_METRICS)
+    for name, values in arrays.items():
+        assert values.shape == (12, 200)
+        np.testing.assert_array_equal(values, repeat[name])  # Same seed, same paths
+    
+    active = arrays["active_customers"]
+    assert (active >= 0).all()
+    # Nobody converts before the sales cycle month, so there is no cost yet
+    assert (active[:2] == 0).all()
+    assert (arrays["cumulative_cost"][:2] == 0).all()
+    assert (np.diff(arrays["cumulative_revenue"], axis=0) >= 0).all()
+    assert (np.diff(arrays["cumulative_cost"], axis=0) >= 0).all()
+    np.testing.assert_allclose(
+        arrays["net_revenue"], arrays["cumulative_revenue"] - arrays["cumulative_cost"]
+    )
+    
+    assert len(summary) == 12
+    np.testing.assert_allclose(
+        summary["net_revenue_mean"], arrays["net_revenue"].mean(axis=1).round(2)
+    )
+
+
+def test_payback_distribution_matches_brute_force():
+    """Test payback months from the array and long-format inputs agree with a scan."""
+    simulator = MonteCarloSimulator(ASSUMPTIONS)
+    arrays, _ = simulator.simulate_revenue_arrays(months=24, n_sims=100)
+    net_revenue = arrays["net_revenue"]
+    # Entry cost that only some simulations recover within the horizon
+    entry_cost = float(np.percentile(net_revenue[-1], 80))
+    
+    payback_df, stats = simulator.calculate_payback_distribution(net_revenue, entry_cost=entry_cost)
+    
+    expected = []
+    for sim in range(net_revenue.shape[1]):
+        months_paid = np.nonzero(net_revenue[:, sim] >= entry_cost)[0]
+        expected.append(months_paid[0] + 1 if len(months_paid) else -1)
+    assert -1 in expected and len(set(expected)) > 2  # Both outcomes occur
+    assert payback_df["payback_period_months"].tolist() == expected
+    assert stats["never_pays_back_pct"] == pytest.approx(100 * expected.count(-1) / len(expected))
+    
+    long_results, _ = simulator.simulate_revenue(months=24, n_sims=100)
+    long_payback, long_stats = simulator.calculate_payback_distribution(long_results, entry_cost=entry_cost)
+    pd.testing.assert_frame_equal(long_payback, payback_df, check_dtype=False)
+    assert long_stats == stats
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
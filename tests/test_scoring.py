@@ -2,7 +2,7 @@
 import pytest
 import pandas as pd
 import numpy as np
-from src.models.scoring import MarketScorer
+from src.models.scoring import MarketScorer, run_full_sensitivity
 
 
 def test_market_scorer_initialization():
@@ -71,6 +71,95 @@ def test_scoring_with_missing_features():
     assert scored.iloc[0]["total_score"] == 1.0
 
 
+def test_scoring_with_precomputed_features():
+    """Test a precomputed feature matrix gives the same scores as the DataFrame."""
+    weights = {
+        "market_size": 0.4,
+        "purchasing_power": 0.3,
+        "digital_readiness": 0.1,
+        "governance_risk": 0.1,
+        "corruption_risk": 0.1
+    }
+    
+    test_data = pd.DataFrame({
+        "country_code": ["AUS", "SGP", "JPN"],
+        "market_size_score_standardized": [1.0, -0.5, 0.2],
+        "purchasing_power_score_standardized": [0.8, 1.0, -0.3],
+        "digital_readiness_score_standardized": [0.5, 0.9, 0.1],
+        "governance_risk_score_standardized": [0.5, 1.2, 0.4],
+        "corruption_risk_score_standardized": [0.6, 1.1, 0.2]
+    })
+    features = test_data.iloc[:, 1:].to_numpy()
+    
+    scorer = MarketScorer(weights)
+    expected = scorer.score_markets(test_data)
+    scored = scorer.score_markets(test_data, features=features)
+    
+    assert scored["country_code"].tolist() == expected["country_code"].tolist()
+    np.testing.assert_allclose(scored["total_score"], expected["total_score"])
+
+
+def test_sensitivity_matches_rescoring():
+    """Test sensitivity sweep agrees with rescoring each weight variation."""
+    weights = {
+        "market_size": 0.25,
+        "purchasing_power": 0.2,
+        "digital_readiness": 0.2,
+        "governance_risk": 0.2,
+        "corruption_risk": 0.15
+    }
+    
+    rng = np.random.default_rng(0)
+    test_data = pd.DataFrame(
+        rng.normal(size=(6, 5)),
+        columns=[
+            "market_size_score_standardized",
+            "purchasing_power_score_standardized",
+            "digital_readiness_score_standardized",
+            "governance_risk_score_standardized",
+            "corruption_risk_score_standardized"
+        ]
+    )
+    test_data.insert(0, "country_code", ["AUS", "SGP", "JPN", "KOR", "NZL", "IND"])
+    
+    results = run_full_sensitivity(test_data, weights, step=0.05, n_runs=40)
+    sens = results["market_size"]
+    
+    assert set(results) == set(weights)
+    assert len(sens) == 40 * 3
+    
+    # Rescore one variation directly and compare the top 3
+    test_weight = sens["weight_value"].iloc[30]
+    scale = (1.0 - test_weight) / (1.0 - weights["market_size"])
+    test_weights = {k: v * scale for k, v in weights.items()}
+    test_weights["market_size"] = test_weight
+    expected = MarketScorer(test_weights).score_markets(test_data).head(3)
+    actual = sens.iloc[30:33]
+    
+    assert actual["country_code"].tolist() == expected["country_code"].tolist()
+    assert actual["rank"].tolist() == expected["rank"].tolist()
+    np.testing.assert_allclose(actual["total_score"], expected["total_score"])
+
+
+def test_scoring_without_components():
+    """Test component columns can be skipped without changing scores."""
+    weights = {"market_size": 0.6, "purchasing_power": 0.4}
+    
+    test_data = pd.DataFrame({
+        "country_code": ["AUS", "SGP", "JPN"],
+        "market_size_score_standardized": [1.0, 0.5, -0.2],
+        "purchasing_power_score_standardized": [0.8, 1.0, 0.3]
+    })
+    
+    scorer = MarketScorer(weights)
+    full = scorer.score_markets(test_data)
+    slim = scorer.score_markets(test_data, include_components=False)
+    
+    assert "score_market_size" in full.columns
+    assert not any(col.startswith("score_") for col in slim.columns)
+    pd.testing.assert_frame_equal(slim, full.drop(columns=["score_market_size", "score_purchasing_power"]))
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
 